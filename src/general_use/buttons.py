@@ -18,7 +18,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 handle button system
 """
 
+import collections
 import enum
+import threading
 from abc import ABC, abstractmethod
 from typing import Union, Callable, Any
 
@@ -36,11 +38,170 @@ default_text_color = (255, 255, 255)
 default_background = (0, 0, 0)
 
 
+class FontMetrics:
+    """
+    remembers how wide characters and words are in a font, so that wrapping
+    text measures each word once instead of remeasuring the line every
+    character.  Words are measured whole, so kerning between their letters is
+    counted.
+    """
+
+    fonts: dict[pygame.font.Font, "FontMetrics"] = dict()
+    max_words = 4096
+
+    def __init__(self, font: pygame.font.Font):
+        self.font = font
+        self.space = font.size(" ")[0]
+        self.chars: dict[str, int] = dict()
+        self.words: dict[str, int] = dict()
+
+    @classmethod
+    def of(cls, font: pygame.font.Font) -> "FontMetrics":
+        metrics = cls.fonts.get(font)
+        if metrics is None:
+            metrics = cls.fonts[font] = cls(font)
+        return metrics
+
+    def char(self, char: str) -> int:
+        width = self.chars.get(char)
+        if width is None:
+            width = self.chars[char] = self.font.size(char)[0]
+        return width
+
+    def word(self, word: str) -> int:
+        width = self.words.get(word)
+        if width is None:
+            if len(self.words) >= self.max_words:
+                self.words.clear()
+            width = self.words[word] = self.font.size(word)[0]
+        return width
+
+    def fitting(self, word: str, pixels: int) -> int:
+        """
+        how many characters from the start of a word fit in a number of pixels
+        """
+        for i, char in enumerate(word):
+            pixels -= self.char(char)
+            if pixels < 0:
+                return i
+        return len(word)
+
+    def wrap(self, text: str, max_line_pixels: int = 0, max_line_words: int = 0, preserve_words: bool = True,
+             max_lines: int = 0) -> list[tuple[str, int]]:
+        """
+        splits text into lines, in one pass
+        :param text: string
+        :param max_line_pixels: maximum number of pixels in a line, 0 for disabled
+        :param max_line_words: maximum number of words in a line, 0 for disabled
+        :param preserve_words: whether or not to preserve words when considering max line pixels
+        :param max_lines: maximum lines, after which the text is cut off with "...", 0 for disabled
+        :return: each line, and how wide it is
+        """
+        lines: list[tuple[str, int]] = []
+        line = ""
+        length = 0
+        words = 0
+
+        def new_line():
+            nonlocal line, length, words
+            lines.append((line, length))
+            line = ""
+            length = 0
+            words = 0
+
+        for paragraph in text.split("\n"):
+            for word in paragraph.split(" "):
+                if not word:  # runs of spaces are kept
+                    if line:
+                        line += " "
+                        length += self.space
+                    continue
+                if words == max_line_words > 0:
+                    new_line()
+                width = self.word(word)
+                if line and length + self.space + width > max_line_pixels > 0:
+                    if preserve_words:
+                        new_line()
+                    else:
+                        # fill the rest of the line with as much of the word as fits
+                        count = self.fitting(word, max_line_pixels - length - self.space)
+                        if count:
+                            line += " " + word[:count]
+                            length += self.space + self.word(word[:count])
+                            word = word[count:]
+                            width = self.word(word)
+                        new_line()
+                if not preserve_words:
+                    while width > max_line_pixels > 0:
+                        count = max(1, self.fitting(word, max_line_pixels))
+                        if count == len(word):
+                            break
+                        line = word[:count]
+                        length = self.word(line)
+                        new_line()
+                        word = word[count:]
+                        width = self.word(word)
+                if line:
+                    line += " " + word
+                    length += self.space + width
+                else:
+                    line = word
+                    length = width
+                words += 1
+            new_line()
+
+        if len(lines) > max_lines > 0:
+            del lines[max_lines:]
+            line = lines[-1][0]
+            while line and self.font.size(line + "...")[0] > max_line_pixels > 0:
+                line = line[:-1]
+            lines[-1] = (line + "...", self.font.size(line + "...")[0])
+        return lines
+
+
+"""
+text that has been drawn, by everything it was drawn with, most recently drawn
+last
+"""
+drawn_text: collections.OrderedDict[tuple, Surface] = collections.OrderedDict()
+DRAWN_TEXT_SIZE = 256
+"""
+held while using drawn_text, since text is also drawn from worker threads (such
+as write_button_text)
+"""
+drawn_text_lock = threading.Lock()
+
+
 class BaseButton(ABC):
 
     def __init__(self, _rect: pygame.rect.Rect, visible_check: Callable[[], bool]):
         self.rect = _rect
         self.visible = visible_check
+        self._drawn_state = None
+        self._drawn_area: Rect | None = None
+
+    def _track_drawn(self, state, area: Rect | None, force: bool = False) -> Rect | None:
+        """
+        records what the button looks like now
+        :param state: anything that changes when the look of the button does
+        :param area: where it is drawn now
+        :param force: count it as changed regardless
+        :return: the area that needs to be redrawn, if it changed
+        """
+        if not force and state == self._drawn_state and area == self._drawn_area:
+            return None
+        old = self._drawn_area
+        self._drawn_state = state
+        self._drawn_area = area
+        return utility.union_rects(old, area)
+
+    def dirty_rect(self, mouse_pos: tuple[int, int]) -> Rect | None:
+        """
+        checks if the button looks different since the last check
+        :return: the area to redraw, in the coordinates the button is drawn
+        in, or None if nothing changed.  Buttons that can't tell always changed.
+        """
+        return self._track_drawn(None, None if self.rect is None else self.rect.copy(), force=True)
 
     @abstractmethod
     def render_onto(self, onto: Surface, mouse_pos: tuple[int, int]) -> None:
@@ -126,7 +287,8 @@ class BaseButton(ABC):
             enforce_width: int = 0
     ) -> Surface:
         """
-        draws text
+        draws text.  The same text drawn the same way is only drawn once, so
+        the surface returned may be shared and shouldn't be drawn on.
         :param text: string
         :param font: font size
         :param background_color: background color for the text
@@ -140,98 +302,22 @@ class BaseButton(ABC):
         :param enforce_width: enforce a width for the display
         :return: drawn text
         """
-        lines: list[tuple[str, int]] = [("", 0)]
-        word = ""
-        current_word_length = 0
-        words = 0
-
-        def clear_word():
-            nonlocal word, current_word_length
-            word = ""
-            current_word_length = 0
-
-        def add_new_line(start: str = ""):
-            nonlocal words, word, current_word_length
-            if start:
-                words = 1
-                clear_word()
-            else:
-                words = 0
-            words = int(bool(start))  # start with 0 if empty string, start with 1 if non-empty
-            if len(lines) == max_lines:
-                return True
-            lines.append((start, current_word_length))  # guaranteed for start == word
-
-        def add_word_to_last_line(check_newline: bool = True):
-            nonlocal word, words, current_word_length
-            if lines[-1][0]:  # if there is something in line, add a space and the word
-                _new_line = lines[-1][0] + " " + word
-                _length = lines[-1][1] + space_size + current_word_length
-                if word and _length > max_line_pixels > 0:  # only check if it goes over if word is not empty
-                    return add_new_line(word)  # nothing to do after adding
-            elif word:  # if there was not something in line, the new line is the word
-                _new_line = word
-                _length = current_word_length
-            else:
-                return False
-
-            lines[-1] = (_new_line, _length)
-
-            if word:  # only increment words counter if word actually had something
-                words += 1
-                clear_word()
-                if check_newline and words == max_line_words:
-                    return add_new_line()
-            return False
-
         if isinstance(font, int):
             draw_font = ButtonHolder.fonts[font]
         else:
             draw_font = font
-        space_size = draw_font.size(" ")[0]
-
-        def get_increase_size(add_char: str) -> int:
-            if word:
-                return draw_font.size(add_char)[0]
-            else:
-                return draw_font.size(word[-1] + add_char)[0] - draw_font.size(add_char)[0]
-
-        i: int = 0
-        while i < len(text):
-            char = text[i]
-            i += 1
-
-            if char == "\n":
-                if add_word_to_last_line(False):  # add word, don't check if it reaches max word count
-                    break
-                if add_new_line():
-                    break
-                continue
-
-            if char == " ":  # check words, not length.  Ok, yes, it also checks length
-                if add_word_to_last_line():
-                    break
-                continue
-
-            if max_line_pixels > 0 and not preserve_words:
-                new_line = (lines[-1] + " " + word).lstrip(" ")
-                length = draw_font.size(new_line + char)[0]
-                if length > max_line_pixels:
-                    lines[-1] = new_line
-                    if add_new_line():
-                        break
-            word += char
-            current_word_length += get_increase_size(char)
-
-        add_word_to_last_line()  # make sure to get the last word out
-
-        if i < len(text):  # if it for some reason quit early (aka there is trailing text)
-            backstep = -1
-            while draw_font.size(lines[-1][:backstep] + "...")[0] > max_line_pixels > 0:
-                backstep -= 1
-                if -1 * backstep >= len(lines[-1]):
-                    break
-            lines[-1] = lines[-1][:backstep] + "..."
+        if background_color is not None:
+            background_color = tuple(background_color)
+        outline_color = tuple(outline_color)
+        key = (text, draw_font, background_color, outline_color, max_line_pixels, max_line_words, max_width,
+               preserve_words, text_align, max_lines, enforce_width)
+        with drawn_text_lock:
+            text_surface = drawn_text.get(key)
+            if text_surface is not None:
+                drawn_text.move_to_end(key)
+                return text_surface
+
+        lines = FontMetrics.of(draw_font).wrap(text, max_line_pixels, max_line_words, preserve_words, max_lines)
 
         if enforce_width != 0:
             max_length = enforce_width
@@ -239,8 +325,10 @@ class BaseButton(ABC):
             max_length = 0
         else:
             max_length = max(_length for line, _length in lines)
-        if max_length > max_width > 0:
+        if max_length > max_width > 0 and isinstance(font, int):
             draw_font = ButtonHolder.fonts[int(font * max_width / max_length)]
+            if enforce_width == 0:
+                max_length = max(draw_font.size(line)[0] for line, _length in lines)
         linesize = draw_font.get_linesize()
         text_surface = Surface((max_length, linesize * len(lines)), SRCALPHA)
         if background_color is not None:
@@ -251,7 +339,10 @@ class BaseButton(ABC):
                 drawn,
                 (text_align * (max_length - drawn.get_width()), i * linesize)
             )
-        text_surface.convert()
+        with drawn_text_lock:
+            drawn_text[key] = text_surface
+            if len(drawn_text) > DRAWN_TEXT_SIZE:
+                drawn_text.popitem(last=False)
         return text_surface
 
 
@@ -337,6 +428,7 @@ class Button(BaseButton):
         self.special_press: tuple = special_press
         self.typing_instance: int = typing_instance
         self.keyed = False
+        self._hover: tuple[tuple, tuple[Surface, tuple[float, float], Rect]] | None = None
 
     @staticmethod
     def make_img_button(
@@ -427,6 +519,64 @@ class Button(BaseButton):
                       , outline_color=outline_color, inflate_center=(x_align, y_align), outline_width=border_width,
                       down_arguments=arguments, special_press=special, visible_check=visible_check)
 
+    def hovered(self, mouse_pos: tuple[int, int]) -> bool:
+        """
+        if the button is clickable and either the mouse is over it or it is keyed
+        """
+        return any(click is not None for click in self.clicks) and (
+            self.keyed or (self.rect is not None and self.rect.collidepoint(mouse_pos))
+        )
+
+    def __hover_center(self) -> tuple[float, float]:
+        """
+        where the scaled up image is centered when hovered
+        """
+        centerx, centery = self.rect.center
+        width, height = centerx - self.rect.x, centery - self.rect.y
+        return (
+            centerx + width * (self.inflate_center[0] - 0.5) * -0.5,
+            centery + height * (self.inflate_center[1] - 0.5) * -0.5
+        )
+
+    def __hover_img(self) -> tuple[Surface, tuple[float, float], Rect]:
+        """
+        the scaled up image, where it goes, and its outline, for when the
+        button is hovered.  Only scaled again when the image or where it is
+        changes.
+        """
+        key = (self.img, tuple(self.rect), self.scale_factor, self.inflate_center, self.outline_width)
+        if self._hover is not None and self._hover[0] == key:
+            return self._hover[1]
+
+        # gets coordinates of button parts for scaling
+        x, y = self.rect.topleft
+        centerx, centery = self.rect.center
+        width, height = centerx - x, centery - y
+        new_centerx, new_centery = self.__hover_center()
+
+        new = scale(
+            self.img,
+            (width * 2 * self.scale_factor, height * 2 * self.scale_factor)
+        )
+        position = (new_centerx - width * self.scale_factor, new_centery - height * self.scale_factor)
+        outline = new.get_rect(center=(new_centerx, new_centery)).inflate(
+            1.75 * self.outline_width,
+            1.75 * self.outline_width
+        )
+        self._hover = (key, (new, position, outline))
+        return self._hover[1]
+
+    def dirty_rect(self, mouse_pos: tuple[int, int]) -> Rect | None:
+        if self.img is None or self.rect is None or not self.visible():
+            return self._track_drawn(None, None)
+        hovered = self.hovered(mouse_pos)
+        area = self.rect.copy()
+        if hovered:
+            area.size = (area.width * self.scale_factor, area.height * self.scale_factor)
+            area.center = self.__hover_center()
+        area.inflate_ip(2 * self.outline_width + 2, 2 * self.outline_width + 2)
+        return self._track_drawn((self.img, hovered, self.outline_color, self.outline_width), area)
+
     def render_onto(self, onto: Surface, mouse_pos: tuple[int, int]) -> None:
         """
         draw onto a surface
@@ -438,33 +588,15 @@ class Button(BaseButton):
             return
         if not self.visible():
             return
-        if any(click is not None for click in self.clicks) and (self.rect.collidepoint(mouse_pos) or self.keyed):
+        if self.hovered(mouse_pos):
             # mouse is over or keyed clicker is on
-
-            # gets coordinates of button parts for scaling
-            x, y = self.rect.topleft
-            centerx, centery = self.rect.center
-            width, height = centerx - x, centery - y
-            new_centerx = centerx + width * (self.inflate_center[0] - 0.5) * -0.5
-            new_centery = centery + height * (self.inflate_center[1] - 0.5) * -0.5
-
-            new = scale(
-                self.img,
-                (width * 2 * self.scale_factor, height * 2 * self.scale_factor)
-            )
-
-            onto.blit(
-                new,
-                (new_centerx - width * self.scale_factor, new_centery - height * self.scale_factor)
-            )
+            new, position, outline = self.__hover_img()
+            onto.blit(new, position)
             if self.outline_width > 0:
                 rect(
                     onto,
                     self.outline_color,
-                    new.get_rect(center=(new_centerx, new_centery)).inflate(
-                        1.75 * self.outline_width,
-                        1.75 * self.outline_width
-                    ),
+                    outline,
                     width=self.outline_width
                 )
         else:
@@ -598,6 +730,7 @@ class Button(BaseButton):
             width = new_img.get_width()
         height = new_img.get_height()
         self.img = new_img
+        self._hover = None
         if override_button_name is None:
             override_button_name = new_text
         self.text = override_button_name
@@ -782,11 +915,7 @@ class DrawButton(Button):
         """
         if not self.visible():
             return
-        over = any(
-            click is not None for click in self.clicks
-        ) and (
-            self.keyed or (self.rect is not None and self.rect.collidepoint(mouse_pos))
-        )
+        over = self.hovered(mouse_pos)
         new_rect = self.draw_func(onto, over, self.rect.topleft, *self.args)
         if new_rect is not None:
             self.img = onto.subsurface(new_rect)
@@ -884,7 +1013,10 @@ class ButtonHolder(BaseButton):
         mouse_pos = self.adjust_mouse_pos(mouse_pos)
         if self.background is None:
             if self.rect is not None:
-                onto = onto.subsurface(onto.get_rect().clip(self.rect))
+                area = onto.get_rect().clip(self.rect)
+                clip = onto.get_clip().move(-area.x, -area.y)  # subsurfaces don't keep their parent's clip
+                onto = onto.subsurface(area)
+                onto.set_clip(clip)
             for button in self.list:
                 if button is None:
                     continue
@@ -904,6 +1036,36 @@ class ButtonHolder(BaseButton):
                     width=self.outline_width
                 )
 
+    def _holder_state(self, mouse_pos: tuple[int, int]) -> tuple:
+        """
+        everything about the holder itself, rather than its buttons, that changes
+        how it looks
+        """
+        return tuple(self.list), self.background, self.fill_color, self.outline_color, self.outline_width
+
+    def dirty_rect(self, mouse_pos: tuple[int, int]) -> Rect | None:
+        if not self.visible():
+            return self._track_drawn(None, None)
+        inside_mouse_pos = self.adjust_mouse_pos(mouse_pos)
+        changed = None
+        for button in self.list:
+            if button is None:
+                continue
+            changed = utility.union_rects(changed, button.dirty_rect(inside_mouse_pos))
+        if self.rect is None:
+            area = game_structures.SCREEN.get_rect()
+        else:
+            area = self.rect.inflate(2 * self.outline_width, 2 * self.outline_width)
+        res = self._track_drawn(self._holder_state(mouse_pos), area)
+        if res is not None or changed is None:
+            return res
+        if self.background is not None:
+            # everything inside is redrawn onto the background, so it all goes onto the screen again
+            return area
+        if self.rect is not None:
+            return changed.move(self.rect.topleft).clip(self.rect)
+        return changed
+
     def fit_size(self, margin: int = 0):
         self.fit_y(margin)
         self.fit_x(margin)
@@ -1121,12 +1283,14 @@ class ScrollableButtonHolder(ButtonHolder):
             visible_cache = [0, 0]
 
             def determine_pos_and_dimensions() -> tuple[int, int, int, int]:
-                length = visible_cache[0] ** 2 // visible_cache[1]
+                length = max(visible_cache[0] ** 2 // visible_cache[1], 20)
                 pos: list[int] = [self.rect.width - 20, self.rect.height - 20]
                 dimensions: list[int] = [20, 20]
                 dimensions[direction] = length
-                pos[direction] = ((self.rect.size[direction]) * self.clip_rect.topleft[direction]) / self.base_rect.size[
-                    direction]
+                pos[direction] = min(
+                    ((self.rect.size[direction]) * self.clip_rect.topleft[direction]) / self.base_rect.size[direction],
+                    self.rect.size[direction] - length
+                )
                 return pos[0], pos[1], dimensions[0], dimensions[1]
 
             def scroll_visible():
@@ -1348,6 +1512,14 @@ class ScrollableButtonHolder(ButtonHolder):
                 width=self.outline_width
             )
 
+    def _holder_state(self, mouse_pos: tuple[int, int]) -> tuple:
+        on_mouse_pos = (mouse_pos[0] - self.rect.x, mouse_pos[1] - self.rect.y)
+        return super()._holder_state(mouse_pos) + (
+            tuple(self.clip_rect),
+            self.base_rect.size,
+            tuple(scroll.rect is not None and scroll.rect.collidepoint(on_mouse_pos) for scroll in self.scrolls)
+        )
+
     def __repr__(self):
         return f"{self.__class__.__name__}[rect: {self.rect}, clip: {self.clip_rect}, list: {self.list}]"
 
@@ -1420,6 +1592,163 @@ class ListHolder(ScrollableButtonHolder):
         super().render_onto(onto, mouse_pos)
 
 
+class VirtualListHolder(ScrollableButtonHolder):
+    """
+    a vertical list that only makes and draws the rows in view, for lists too
+    long to keep every row around.  Rows are evenly spaced, so which are in view
+    is worked out from the scroll position rather than by checking every row.
+    Rows near the view are kept, so scrolling back and forth doesn't remake
+    them, and the window is drawn onto the same surface every frame.
+    """
+
+    def __init__(
+            self,
+            window_rect: Rect,
+            row_height: int,
+            make_row: Callable[[int], BaseButton | None],
+            row_count: int = 0,
+            x_pos: int = 0,
+            y_separation: int = 0,
+            step: int = 1,
+            fill_color: Union[tuple[int, int, int], tuple[int, int, int, int], None] = default_background,
+            outline_color: Union[tuple[int, int, int], None] = default_text_color,
+            outline_width: int = 0,
+            visible_check: Callable[[], bool] = utility.passing
+    ):
+        """
+        initializes
+        :param row_height: height of each row, including the space after it
+        :param make_row: makes the row at an index, when it comes into view
+        :param row_count: how many rows there are
+        :param x_pos: x position of rows in the window
+        :param y_separation: space above the first row
+        """
+        self.row_height = row_height
+        self.make_row = make_row
+        self.row_count = row_count
+        self.rows: dict[int, BaseButton | None] = dict()
+        self.__x_pos = x_pos
+        self.__y_sep = y_separation
+        self.__in_view: tuple[int, int, int] | None = None
+        super().__init__(
+            window_rect,
+            pygame.Surface(window_rect.size),
+            False,
+            True,
+            0,
+            0,
+            step,
+            None,
+            fill_color,
+            outline_color,
+            outline_width,
+            visible_check
+        )
+
+    def set_rows(self, row_count: int) -> None:
+        """
+        changes how many rows there are, and forgets every row made so far
+        """
+        self.row_count = row_count
+        self.rows.clear()
+        self.list = []
+        self.__in_view = None
+        self.fit_size()
+        self.y = self.y
+
+    def clear(self):
+        self.set_rows(0)
+
+    def __len__(self):
+        return self.row_count
+
+    def fit_y(self, margin: int = 0):
+        self.base_rect.height = max(
+            self.__y_sep + self.row_count * self.row_height + margin,
+            self.clip_rect.height
+        )
+
+    def fit_x(self, margin: int = 0):
+        self.base_rect.width = self.clip_rect.width
+
+    def change_window(self, pos: tuple[int, int] = None, size: tuple[int, int] = None):
+        super().change_window(pos, size)
+        if self.background.get_size() != self.rect.size:
+            self.background = pygame.Surface(self.rect.size, self.background.get_flags())
+        self.fit_size()
+        self.__in_view = None
+
+    def rows_in_view(self) -> range:
+        first = max(0, (self.y - self.__y_sep) // self.row_height)
+        last = min(self.row_count, (self.y + self.rect.height - self.__y_sep) // self.row_height + 1)
+        return range(first, max(first, last))
+
+    def update_rows(self) -> None:
+        """
+        makes the rows that came into view, forgets ones far from view, and
+        moves the rows in view to where they are in the window
+        """
+        in_view = self.rows_in_view()
+        key = (in_view.start, in_view.stop, self.y)
+        if key == self.__in_view:
+            return
+        self.__in_view = key
+        keep = range(in_view.start - len(in_view), in_view.stop + len(in_view))
+        for i in [i for i in self.rows if i not in keep]:
+            del self.rows[i]
+        self.list = []
+        for i in in_view:
+            if i not in self.rows:
+                self.rows[i] = self.make_row(i)
+            row = self.rows[i]
+            if row is None or row.rect is None:
+                continue
+            row.rect.topleft = (self.__x_pos, self.__y_sep + i * self.row_height - self.y)
+            self.list.append(row)
+
+    def adjust_mouse_pos(self, mouse_pos: tuple[int, int]) -> tuple[int, int]:
+        return mouse_pos[0] - self.rect.x, mouse_pos[1] - self.rect.y
+
+    def do_click(self, mouse_pos: tuple[int, int], click_type) -> bool:
+        if not self.visible():
+            return False
+        self.update_rows()
+        clip_mouse_pos = self.adjust_mouse_pos(mouse_pos)
+        for scroll in self.scrolls:
+            if scroll.do_click(clip_mouse_pos, click_type):
+                return True
+        if not self.rect.collidepoint(mouse_pos):
+            return False
+        for button in self.list:
+            if button.do_click(clip_mouse_pos, click_type):
+                return True
+        return False
+
+    def dirty_rect(self, mouse_pos: tuple[int, int]) -> Rect | None:
+        if self.visible():
+            self.update_rows()
+        return super().dirty_rect(mouse_pos)
+
+    def render_onto(self, onto: Surface, mouse_pos: tuple[int, int]) -> None:
+        if not self.visible():
+            return
+        self.update_rows()
+        inside_mouse_pos = self.adjust_mouse_pos(mouse_pos)
+        self.background.fill(self.fill_color)
+        for button in self.list:
+            button.render_onto(self.background, inside_mouse_pos)
+        for scroll in self.scrolls:
+            scroll.render_onto(self.background, inside_mouse_pos)
+        onto.blit(self.background, self.rect)
+        if self.outline_width > 0:
+            rect(
+                onto,
+                self.outline_color,
+                self.rect.inflate(2 * self.outline_width, 2 * self.outline_width),
+                width=self.outline_width
+            )
+
+
 class HorizontalListHolder(ScrollableButtonHolder):
     """
     a ScrollableButtonHolder, except it also enforces an x position, spacing between elements, and window size.
@@ -1584,3 +1913,10 @@ class PassThroughSwitchHolder(BaseButton):
     def render_onto(self, onto: Surface, mouse_pos: tuple[int, int]) -> None:
         if self.visible():
             self.on.render_onto(onto, mouse_pos)
+
+    def dirty_rect(self, mouse_pos: tuple[int, int]) -> Rect | None:
+        if not self.visible():
+            return self._track_drawn(None, None)
+        changed = self.on.dirty_rect(mouse_pos)
+        res = self._track_drawn(self.on, self.on._drawn_area)
+        return utility.union_rects(res, changed)
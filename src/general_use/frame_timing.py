@@ -0,0 +1,163 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+times each phase of a frame, and draws an overlay of how long they take in
+admin mode.  Cheap enough to always be on: a phase is one clock read and one
+append.
+"""
+import collections
+import time
+from typing import Callable
+
+import pygame
+
+from data import game_states
+from general_use import game_structures
+
+
+"""
+how many frames of timings to keep for each phase
+"""
+HISTORY_LENGTH = 300
+
+"""
+how many frames the overlay is kept before it is redrawn
+"""
+OVERLAY_REFRESH = 30
+
+"""
+the key that shows and hides the overlay, in admin mode
+"""
+OVERLAY_KEY = pygame.K_F3
+
+"""
+timings of each phase, in nanoseconds, most recent last.  Phases show up in the
+overlay in the order they were first timed.
+"""
+PHASES: dict[str, collections.deque[int]] = dict()
+
+"""
+counts shown under the timings, such as how many entities there are
+"""
+COUNTERS: dict[str, Callable[[], int]] = dict()
+
+SHOW_OVERLAY: bool = True
+
+__last: int = 0
+__overlay: pygame.Surface | None = None
+__overlay_age: int = 0
+
+
+def begin() -> None:
+    """
+    starts timing from now, so that the next lap doesn't count anything before
+    """
+    global __last
+    __last = time.perf_counter_ns()
+
+
+def lap(phase: str) -> None:
+    """
+    records the time since the last lap (or begin) as the time of a phase
+    """
+    global __last
+    now = time.perf_counter_ns()
+    samples = PHASES.get(phase)
+    if samples is None:
+        samples = PHASES[phase] = collections.deque(maxlen=HISTORY_LENGTH)
+    samples.append(now - __last)
+    __last = now
+
+
+def percentiles(phase: str, *ps: float) -> list[float]:
+    """
+    percentiles of the recent timings of a phase, in milliseconds
+    """
+    samples = sorted(PHASES.get(phase, ()))
+    if not samples:
+        return [0.0 for _ in ps]
+    return [samples[min(len(samples) - 1, int(p / 100 * len(samples)))] / 1_000_000 for p in ps]
+
+
+def clear() -> None:
+    """
+    forgets every timing, so that a new run isn't averaged with the last one
+    """
+    global __overlay
+    PHASES.clear()
+    __overlay = None
+
+
+def toggle_overlay() -> None:
+    global SHOW_OVERLAY
+    SHOW_OVERLAY = not SHOW_OVERLAY
+
+
+def __make_overlay() -> pygame.Surface:
+    font = game_structures.TUTORIAL_FONTS[30]
+    rows = [("phase", "p50 ms", "p99 ms")]
+    for phase in PHASES:
+        p50, p99 = percentiles(phase, 50, 99)
+        rows.append((phase, f"{p50:.2f}", f"{p99:.2f}"))
+    rows.extend((name, str(counter()), "") for name, counter in COUNTERS.items())
+    rendered = [[font.render(cell, False, (255, 255, 255)) for cell in row] for row in rows]
+    widths = [max(row[i].get_width() for row in rendered) + 20 for i in range(3)]
+    row_height = font.get_linesize()
+    overlay = pygame.Surface((sum(widths) + 10, row_height * len(rendered) + 10), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 160))
+    for y, row in enumerate(rendered):
+        x = 5
+        for cell, width in zip(row, widths):
+            overlay.blit(cell, (x, 5 + y * row_height))
+            x += width
+    return overlay
+
+
+def __overlay_rect() -> pygame.Rect:
+    """
+    where the overlay goes: the middle of the right edge, since every corner of
+    the main screen has a button in it
+    """
+    return __overlay.get_rect(midright=(game_states.WIDTH, game_states.HEIGHT // 2))
+
+
+def update_overlay() -> pygame.Rect | None:
+    """
+    rerenders the overlay every OVERLAY_REFRESH frames, and gets rid of it when
+    it's turned off
+    :return: where the overlay changed on screen, if it did
+    """
+    global __overlay, __overlay_age
+    old = None if __overlay is None else __overlay_rect()
+    if not (game_states.ADMIN and SHOW_OVERLAY and PHASES):
+        __overlay = None
+        return old
+    __overlay_age += 1
+    if __overlay is not None and __overlay_age < OVERLAY_REFRESH:
+        return None
+    __overlay = __make_overlay()
+    __overlay_age = 0
+    new = __overlay_rect()
+    return new if old is None else new.union(old)
+
+
+def draw_overlay() -> None:
+    """
+    draws the timing overlay on the right, if it's on
+    """
+    if __overlay is not None:
+        game_structures.SCREEN.blit(__overlay, __overlay_rect())
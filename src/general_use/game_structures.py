@@ -18,13 +18,13 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 a module containing classes for various game structures
 """
 from dataclasses import dataclass
-from typing import Union, Callable
+from typing import Union, Callable, Iterable
 
 from pygame.font import Font, SysFont
 from pygame.transform import scale
 import pygame.mixer
 from pygame.event import custom_type
-from collections import deque
+from collections import deque, OrderedDict
 from threading import Lock
 
 from general_use import utility
@@ -33,6 +33,7 @@ from io import BytesIO
 from data import images, game_states
 
 import math
+import numpy
 
 
 def recursive_subclasses(cls: type) -> list[type]:
@@ -60,13 +61,19 @@ class Place:
             catcher: Callable = utility.make_simple_always(False),
             crash_on: Callable = utility.make_simple_always(False),
             exit_on: Callable = utility.passing,
+            static: bool = False
     ):
+        """
+        :param static: if the place only ever draws buttons, so that only the
+        parts of the screen where buttons change need to be redrawn
+        """
         self.tick = tick
         self.enter = enter
         self.end = end
         self.catcher = catcher
         self.crash = crash_on
         self.exit = exit_on
+        self.static = static
 
     def start(self, *args, **kwargs):
         switch_to_place(self, *args, **kwargs)
@@ -75,11 +82,19 @@ class Place:
 def switch_to_place(place: Place, *args, **kwargs):
     if not isinstance(place, Place):
         return switch_to_place(place.value, *args, **kwargs)
+    global REDRAW_ALL
     if game_states.PLACE:
         game_states.PLACE.end(*args, **kwargs)
     game_states.PLACE = place
     game_states.PLACE.enter(*args, **kwargs)
     BUTTONS.convert()
+    REDRAW_ALL = True
+
+
+"""
+if the whole screen needs to be drawn next frame, even in a static place
+"""
+REDRAW_ALL: bool = True
 
 
 def display_screen():
@@ -88,11 +103,57 @@ def display_screen():
     pygame.display.flip()
 
 
+"""
+which pixel of the screen each column and row of the true screen shows, when the
+screen is scaled down onto it
+"""
+__true_columns: numpy.ndarray | None = None
+__true_rows: numpy.ndarray | None = None
+
+
+def __scale_map(size: int, true_size: int) -> numpy.ndarray:
+    """
+    which pixel each of the scaled pixels comes from, along one side.  Read back
+    from pygame.transform.scale, so that scaling part of the screen matches
+    scaling all of it exactly
+    """
+    line = pygame.Surface((size, 1), depth=32)
+    pixels = pygame.surfarray.pixels2d(line)
+    pixels[:, 0] = numpy.arange(size)
+    del pixels
+    return pygame.surfarray.array2d(scale(line, (true_size, 1)))[:, 0].astype(numpy.intp)
+
+
+def display_rects(rects: list[pygame.Rect]):
+    """
+    only updates parts of the display
+    :param rects: the parts of the screen to update
+    """
+    if TRUE_HEIGHT > 0:
+        factor = TRUE_HEIGHT / game_states.HEIGHT
+        true_rects = []
+        screen_pixels = pygame.surfarray.pixels3d(SCREEN)
+        true_pixels = pygame.surfarray.pixels3d(TRUE_SCREEN)
+        for r in rects:
+            left, top = math.floor(r.left * factor), math.floor(r.top * factor)
+            r = pygame.Rect(
+                left, top, math.ceil(r.right * factor) - left, math.ceil(r.bottom * factor) - top
+            ).clip(TRUE_SCREEN.get_rect())
+            # only scale the parts that changed
+            true_pixels[r.left:r.right, r.top:r.bottom] = screen_pixels[
+                numpy.ix_(__true_columns[r.left:r.right], __true_rows[r.top:r.bottom])
+            ]
+            true_rects.append(r)
+        del screen_pixels, true_pixels
+        rects = true_rects
+    pygame.display.update(rects)
+
+
 __minimum_height = 2 * 864
 
 
 def determine_screen():
-    global TRUE_HEIGHT, TRUE_WIDTH, TRUE_SCREEN, SCREEN
+    global TRUE_HEIGHT, TRUE_WIDTH, TRUE_SCREEN, SCREEN, __true_columns, __true_rows
     # print(game_states.HEIGHT, __minimum_height)
     if game_states.HEIGHT < __minimum_height:
         TRUE_SCREEN = SCREEN
@@ -102,6 +163,8 @@ def determine_screen():
         game_states.WIDTH = round(game_states.WIDTH * __minimum_height / game_states.HEIGHT)  # scale width appropriately
         game_states.HEIGHT = __minimum_height
         SCREEN = pygame.Surface((game_states.WIDTH, game_states.HEIGHT), pygame.SRCALPHA)
+        __true_columns = __scale_map(game_states.WIDTH, TRUE_WIDTH)
+        __true_rows = __scale_map(game_states.HEIGHT, TRUE_HEIGHT)
 
 
 def to_screen_x(x: int = 0) -> int:
@@ -584,11 +647,67 @@ def init() -> None:
         main = main_screen.main_screen_place
 
 
+class RotationCache:
+    """
+    a least-recently-used cache of rotated images, shared so that every body with
+    the same image shares its rotations.  Angles are rounded to the nearest
+    multiple of the quantum first.
+    """
+
+    def __init__(self, max_size: int = 2048, quantum: int | float = 1):
+        self.max_size = max_size
+        self.quantum = quantum
+        self.__cache: OrderedDict[tuple[Surface, int | float, bool], Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    def quantize(self, angle: int | float) -> int | float:
+        return round(angle / self.quantum) * self.quantum % 360
+
+    def __get(self, img: Surface, angle: int | float, flashing: bool) -> Surface:
+        key = (img, self.quantize(angle), flashing)
+        res = self.__cache.get(key)
+        if res is not None:
+            self.__cache.move_to_end(key)
+            return res
+        if flashing:
+            res = utility.make_flashing_img(self.rotate(img, angle))
+        else:
+            res = pygame.transform.rotate(img, key[1])
+        self.__cache[key] = res
+        if len(self.__cache) > self.max_size:
+            self.__cache.popitem(last=False)
+        return res
+
+    def rotate(self, img: Surface, angle: int | float) -> Surface:
+        return self.__get(img, angle, False)
+
+    def flashing(self, img: Surface, angle: int | float) -> Surface:
+        """
+        the flashing version of a rotated image
+        """
+        return self.__get(img, angle, True)
+
+    def clear(self) -> None:
+        self.__cache.clear()
+
+
+ROTATIONS = RotationCache()
+
+
 class Body:
     """
     a supercontainer for Rects.  Allows for rotation.
     """
 
+    # fixed attributes instead of a dict, to keep the many bodies in play small
+    __slots__ = (
+        "__original_img", "_rotated_img", "__flashing_img", "__radius", "__rotation",
+        "_x", "_y", "__x_frozen", "__y_frozen",
+        "__offsets_key", "__offsets", "__axes", "__shape_key", "__shape_cache",
+    )
+
     @property
     def rotation(self):
         return self.__rotation
@@ -603,22 +722,25 @@ class Body:
     @property
     def img(self):
         if self._rotated_img is None and self.__original_img is not None:
-            self._rotated_img = pygame.transform.rotate(self.__original_img, self.__rotation)
+            self._rotated_img = ROTATIONS.rotate(self.__original_img, self.__rotation)
         return self._rotated_img
 
     @img.setter
     def img(self, val: Surface):
         if isinstance(val, images.Image):
             val = val.img
-        self.__radius = Body.__calc_radius(val.get_width(), val.get_height())
+        radius = Body.__calc_radius(val.get_width(), val.get_height())
+        if radius != self.__radius:
+            self.radius_changed(self.__radius, radius)
+            self.__radius = radius
         self.__original_img = val
         self._rotated_img = None
         self.__flashing_img = None
 
     @property
     def flashing_img(self):
-        if self.__flashing_img is None:
-            self.__flashing_img = utility.make_flashing_img(self.img)
+        if self.__flashing_img is None and self.__original_img is not None:
+            self.__flashing_img = ROTATIONS.flashing(self.__original_img, self.__rotation)
         return self.__flashing_img
 
     @utility.memoize(guarantee_natural=True)
@@ -629,6 +751,11 @@ class Body:
     def radius(self) -> int:
         return self.__radius
 
+    def radius_changed(self, old: int, new: int) -> None:
+        """
+        called when a new image changes the radius, before it changes
+        """
+
     @property
     def width(self):
         return self.__original_img.get_width()
@@ -687,6 +814,8 @@ class Body:
         self.rotation = rotation
         self.__x_frozen = False
         self.__y_frozen = False
+        self.__offsets_key = None
+        self.__shape_key = None
         if pos is not None:
             self.x = pos[0]
             self.y = pos[1]
@@ -695,117 +824,121 @@ class Body:
     def rect(self):
         if self.__original_img is None:
             return None
-        if self._rotated_img is None:
-            self._rotated_img = pygame.transform.rotate(self.__original_img, self.rotation)
-        return self._rotated_img.get_rect(center=self.pos)
+        return self.img.get_rect(center=self.pos)
 
-    def __corners_helper(self, x_width_offset, x_height_offset, y_width_offset, y_height_offset, width_factor, height_factor):
+    def __shape(self) -> tuple[tuple[tuple[int, int], ...], tuple[int, int, int, int], tuple[tuple[int, int], ...]]:
         """
-        a helper to find a corner
-        :return: corner
+        the corners, bounding box (left, bottom, right, top) and separating axes
+        of the body.  The corners relative to the center are only found again
+        when the rotation or size changes, and the rest when the position does.
         """
-        return (
-            self.x + x_width_offset * width_factor + x_height_offset * height_factor,
-            self.y + y_height_offset * height_factor - y_width_offset * width_factor
-        )
+        x, y = self.x, self.y
+        offsets_key = (self.rotation, self.width, self.height)
+        if offsets_key != self.__offsets_key:
+            theta = math.radians(-offsets_key[0])
+            # affecting _
+            x_width_offset = (offsets_key[1] * math.cos(theta)) // 2
+            x_height_offset = (offsets_key[2] * math.sin(theta)) // 2
+            y_width_offset = (offsets_key[1] * math.sin(theta)) // 2
+            y_height_offset = (offsets_key[2] * math.cos(theta)) // 2
+            self.__offsets = tuple(
+                (
+                    x_width_offset * width_factor + x_height_offset * height_factor,
+                    y_height_offset * height_factor - y_width_offset * width_factor
+                )
+                for width_factor, height_factor in ((-1, 1), (1, 1), (1, -1), (-1, -1))
+            )
+            (x0, y0), (x1, y1), (x2, y2), _ = self.__offsets
+            # corners are rounded, so the sides aren't quite square, and need their own normals
+            self.__axes = ((y0 - y1, x1 - x0), (y1 - y2, x2 - x1))
+            self.__offsets_key = offsets_key
+            self.__shape_key = None
+        shape_key = (x, y)
+        if shape_key != self.__shape_key:
+            corners = tuple((x + dx, y + dy) for dx, dy in self.__offsets)
+            xs = [corner[0] for corner in corners]
+            ys = [corner[1] for corner in corners]
+            self.__shape_cache = (corners, (min(xs), min(ys), max(xs), max(ys)), self.__axes)
+            self.__shape_key = shape_key
+        return self.__shape_cache
 
     @property
     def corners(self) -> tuple[tuple[int, int], tuple[int, int], tuple[int, int], tuple[int, int]]:
-        theta = math.radians(-self.rotation)
-        # affecting _
-        x_width_offset = (self.width * math.cos(theta)) // 2
-        x_height_offset = (self.height * math.sin(theta)) // 2
-        y_width_offset = (self.width * math.sin(theta)) // 2
-        y_height_offset = (self.height * math.cos(theta)) // 2
         # noinspection PyTypeChecker
-        return tuple(
-            self.__corners_helper(x_width_offset, x_height_offset, y_width_offset, y_height_offset,
-                2 - 2 * abs(i - 1.5), abs(4 - 2 * abs(i - 0.5)) - 2)
-            for i in range(4)
-        )
+        return self.__shape()[0]
 
-    def collide(self, other):
+    @staticmethod
+    def separated(
+            this_points: tuple[tuple[int, int], ...],
+            other_points: tuple[tuple[int, int], ...],
+            axes: tuple[tuple[int, int], ...]
+    ) -> bool:
         """
-        tests if two objects collide.  The other object should be a Body, or subclass.
-        :param other: needs to have a rect value that is a pygame Rect
+        checks if two convex polygons are separated along any of the axes
         :return:
         """
-        if not self.rect.colliderect(other.rect):
-            return False
-        this_corners = self.corners
-        other_corners = other.corners
-        if self.sides_intersect(this_corners, other_corners):
-            return True
-        # if self.point_inside_points(this_corners[0], other_corners):
-        #     return True
-        # if self.point_inside_points(other_corners[0], this_corners):
-        #     return True
+        for axis_x, axis_y in axes:
+            this = [px * axis_x + py * axis_y for px, py in this_points]
+            other = [px * axis_x + py * axis_y for px, py in other_points]
+            if max(this) < min(other) or max(other) < min(this):
+                return True
         return False
 
-    def colliderect(self, other: pygame.Rect):
+    def collide(self, other):
         """
-        check if a body collides with a rect from pygame
-        :param other:
+        tests if two objects collide, including if one is inside the other.  The
+        other object should be a Body, or subclass.
+        :param other: a Body
         :return:
         """
-        if not self.rect.colliderect(other):
+        this_corners, this_bounds, this_axes = self.__shape()
+        other_corners, other_bounds, other_axes = other.__shape()
+        if (
+                this_bounds[2] < other_bounds[0] or other_bounds[2] < this_bounds[0] or
+                this_bounds[3] < other_bounds[1] or other_bounds[3] < this_bounds[1]
+        ):
             return False
-        this_corners = self.corners
-        other_corners = (other.topleft, other.topright, other.bottomright, other.bottomleft)
-        if self.sides_intersect(this_corners, other_corners):
-            return True
-        if other.collidepoint(this_corners[0][0], this_corners[0][1]):
-            return True
-        return self.point_inside_points(other_corners[0], this_corners)
-
-    @staticmethod
-    def __counter_clockwise(a: tuple[int, int], b: tuple[int, int], c: tuple[int, int]):
-        return (c[1] - a[1]) * (b[0] - a[0]) > (b[1] - a[1]) * (c[0] - a[0])
+        return not (
+                self.separated(this_corners, other_corners, this_axes) or
+                self.separated(this_corners, other_corners, other_axes)
+        )
 
-    @staticmethod
-    def intersect(a: tuple[int, int], b: tuple[int, int], c: tuple[int, int], d: tuple[int, int]):
+    def collide_all(self, others: Iterable) -> list:
         """
-        checks if line segment AB intersects CD
+        the bodies out of many that collide with this one.  Works out this
+        body's shape once for all of them.
+        :param others: Bodies
         :return:
         """
-        return Body.__counter_clockwise(a, c, d) != Body.__counter_clockwise(b, c, d) and Body.__counter_clockwise(a, b, c) != Body.__counter_clockwise(a, b, d)
-
-    @staticmethod
-    def sides_intersect(
-            this_points: tuple[tuple[int, int], tuple[int, int], tuple[int, int], tuple[int, int]],
-            other_points: tuple[tuple[int, int], tuple[int, int], tuple[int, int], tuple[int, int]]
-    ) -> bool:
-        for other_i in range(4):
-            for this_i in range(4):
-                if Body.intersect(
-                        other_points[other_i - 1], other_points[other_i],
-                        this_points[this_i], this_points[this_i - 1]
-                ):
-                    return True
-        return False
+        this_corners, (left, bottom, right, top), this_axes = self.__shape()
+        separated = self.separated
+        res = []
+        for other in others:
+            other_corners, other_bounds, other_axes = other.__shape()
+            if right < other_bounds[0] or other_bounds[2] < left or top < other_bounds[1] or other_bounds[3] < bottom:
+                continue
+            if separated(this_corners, other_corners, this_axes) or separated(this_corners, other_corners, other_axes):
+                continue
+            res.append(other)
+        return res
 
-    @staticmethod
-    def point_inside_points(
-            point: tuple[int, int],
-            points: tuple[tuple[int, int], tuple[int, int], tuple[int, int],
-                          tuple[int, int]]
-    ) -> bool:
+    def colliderect(self, other: pygame.Rect):
         """
-        checks if a point is within a polygon defined by other points
-        :param point:
-        :param points:
-        """
-        passed_through = 0
-        x = point[0]
-        y = point[1]
-        for i in range(len(points)):
-            point_1 = points[i]
-            point_2 = points[i - 1]
-            if abs(point_1[0] - point_2[0]) // 2 > abs(x - (point_1[0] + point_2[0]) // 2):
-                if point_1[1] + (x - point_1[0]) * (point_2[1] - point_1[1]) / (point_2[0] - point_1[0]) > y:
-                    passed_through += 1
-        return bool(passed_through % 2)
-
+        check if a body collides with a rect from pygame
+        :param other:
+        :return:
+        """
+        this_corners, this_bounds, this_axes = self.__shape()
+        if (
+                this_bounds[2] < other.left or other.right < this_bounds[0] or
+                this_bounds[3] < other.top or other.bottom < this_bounds[1]
+        ):
+            return False
+        other_corners = (other.topleft, other.topright, other.bottomright, other.bottomleft)
+        return not (
+                self.separated(this_corners, other_corners, this_axes) or
+                self.separated(this_corners, other_corners, ((1, 0), (0, 1)))
+        )
 
 CUSTOM_EVENT_CATCHERS: list[Callable] = []
 PLACES = None
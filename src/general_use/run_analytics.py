@@ -0,0 +1,205 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+statistics over every logged run.  They are kept up to date as runs are logged
+and saved next to the run log, so asking for them never reads old runs again.
+"""
+import ast
+import collections
+import json
+import os
+
+from general_use import run_log
+
+
+STATS_PATH = "./run_log.stats.json"
+
+"""
+how many of the most recent runs rolling averages are over
+"""
+ROLLING_LENGTH = 100
+
+"""
+the fields that are averaged
+"""
+AVERAGED = ("furthest", "progress")
+
+
+def number(value) -> int | None:
+    """
+    a logged number, or None for ones that weren't logged (such as "N/A")
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class RunStats:
+    """
+    statistics folded together from runs, one run at a time
+    """
+
+    def __init__(self):
+        self.runs: int = 0  # how many runs from the log have been counted
+        self.best_by_seed: dict[str, int] = dict()
+        self.area_counts: collections.Counter[str] = collections.Counter()
+        self.reasons: collections.Counter[str] = collections.Counter()
+        self.totals: dict[str, int] = {field: 0 for field in AVERAGED}
+        self.counted: dict[str, int] = {field: 0 for field in AVERAGED}
+        self.recent: dict[str, collections.deque[int]] = {
+            field: collections.deque(maxlen=ROLLING_LENGTH) for field in AVERAGED
+        }
+
+    def add(self, run: dict) -> None:
+        """
+        counts a run
+        """
+        self.runs += 1
+        self.reasons[str(run.get("reason", "N/A"))] += 1
+        furthest = number(run.get("furthest"))
+        if furthest is not None:
+            seed = str(run.get("seed", "N/A"))
+            self.best_by_seed[seed] = max(furthest, self.best_by_seed.get(seed, furthest))
+        for field in AVERAGED:
+            value = number(run.get(field))
+            if value is None:
+                continue
+            self.totals[field] += value
+            self.counted[field] += 1
+            self.recent[field].append(value)
+        try:
+            rooms = ast.literal_eval(run.get("room_record", "{}"))
+        except (ValueError, SyntaxError):
+            return
+        if isinstance(rooms, dict):
+            self.area_counts.update({str(name): count for name, count in rooms.items() if number(count)})
+
+    def best_distance(self, seed: int | str) -> int | None:
+        """
+        the furthest any run on a seed has gone
+        """
+        return self.best_by_seed.get(str(seed))
+
+    def area_frequencies(self) -> dict[str, float]:
+        """
+        how much of all areas passed each type of area has been, most common first
+        """
+        total = sum(self.area_counts.values())
+        return {name: count / total for name, count in self.area_counts.most_common()}
+
+    def death_reasons(self) -> dict[str, int]:
+        """
+        how many runs ended for each reason, most common first
+        """
+        return dict(self.reasons.most_common())
+
+    def mean(self, field: str) -> float:
+        return self.totals[field] / self.counted[field] if self.counted[field] else 0.0
+
+    def rolling_average(self, field: str) -> float:
+        """
+        the average of a field over the last ROLLING_LENGTH runs
+        """
+        recent = self.recent[field]
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def to_json(self) -> dict:
+        return {
+            "runs": self.runs,
+            "best_by_seed": self.best_by_seed,
+            "area_counts": self.area_counts,
+            "reasons": self.reasons,
+            "totals": self.totals,
+            "counted": self.counted,
+            "recent": {field: list(values) for field, values in self.recent.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "RunStats":
+        stats = cls()
+        stats.runs = data["runs"]
+        stats.best_by_seed = data["best_by_seed"]
+        stats.area_counts.update(data["area_counts"])
+        stats.reasons.update(data["reasons"])
+        stats.totals.update(data["totals"])
+        stats.counted.update(data["counted"])
+        for field, values in data["recent"].items():
+            stats.recent[field].extend(values)
+        return stats
+
+    def save(self, path: str = STATS_PATH) -> None:
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.to_json(), file)
+        os.replace(path + ".tmp", path)
+
+
+__stats: RunStats | None = None
+
+
+def load(path: str = STATS_PATH) -> RunStats:
+    try:
+        with open(path, "r") as file:
+            return RunStats.from_json(json.load(file))
+    except (OSError, ValueError, KeyError):
+        return RunStats()
+
+
+def get_stats(log: run_log.RunLog | None = None) -> RunStats:
+    """
+    the statistics, caught up with the run log.  Only runs logged since the
+    statistics were last saved are read.  If the log was cleared, they are
+    counted again from the start.  Catching up on a long log can take a while,
+    so this is only done when the statistics are shown.
+    """
+    global __stats
+    if log is None:
+        log = run_log.RunLog()
+    if __stats is None:
+        __stats = load()
+    length = len(log)
+    if __stats.runs > length:
+        __stats = RunStats()
+    if __stats.runs < length:
+        for run in log.iter_from(__stats.runs):
+            __stats.add(run)
+        # runs that couldn't be read were skipped, but still count as caught up
+        __stats.runs = length
+        __stats.save()
+    return __stats
+
+
+def add_run(log: run_log.RunLog, run: dict) -> None:
+    """
+    counts a run that was just logged, if the statistics were caught up with
+    the log before it.  If they weren't, it's left for get_stats to count with
+    the rest, so that ending a run never reads old runs.
+    """
+    global __stats
+    if __stats is None:
+        __stats = load()
+    if __stats.runs == len(log) - 1:
+        __stats.add(run)
+        __stats.save()
+
+
+def clear() -> None:
+    """
+    forgets every run, for when the log is cleared
+    """
+    global __stats
+    __stats = RunStats()
+    __stats.save()
@@ -0,0 +1,223 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+the log of every run played.  Runs are stored one JSON object per line, with a
+sidecar index of where each line starts (8 little-endian bytes per run), so any
+run can be read without reading the ones before it.
+"""
+import ast
+import json
+import os
+from typing import Iterable, Iterator
+
+
+LOG_PATH = "./run_log.jsonl"
+INDEX_PATH = "./run_log.idx"
+
+"""
+the old log, one python dict per line.  Moved into the new log the first time it
+is opened, then renamed to OLD_LOG_PATH + ".migrated".  While it is being moved,
+OLD_LOG_PATH + ".migrating" holds how long the new log was before the move.
+"""
+OLD_LOG_PATH = "./run_log.txt"
+
+OFFSET_SIZE = 8
+
+
+class RunLog:
+    """
+    an append-only log of runs, readable by run number
+    """
+
+    def __init__(self, path: str = LOG_PATH, index_path: str = INDEX_PATH):
+        self.path = path
+        self.index_path = index_path
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self.index_path) // OFFSET_SIZE
+        except FileNotFoundError:
+            return 0
+
+    def __offset(self, index_file, i: int) -> int:
+        index_file.seek(i * OFFSET_SIZE)
+        return int.from_bytes(index_file.read(OFFSET_SIZE), "little")
+
+    def __getitem__(self, i: int) -> dict:
+        length = len(self)
+        if i < 0:
+            i += length
+        if not 0 <= i < length:
+            raise IndexError(f"run {i} is not in a log of {length} runs")
+        with open(self.index_path, "rb") as index_file:
+            offset = self.__offset(index_file, i)
+        with open(self.path, "rb") as log_file:
+            log_file.seek(offset)
+            return json.loads(log_file.readline())
+
+    @staticmethod
+    def __parse(lines: Iterable[bytes]) -> Iterator[dict]:
+        """
+        the runs on lines of the log, skipping (and logging) any that can't be
+        read, such as one cut off by an interrupted write
+        """
+        from general_use import utility
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                e.add_note(f"Occurred while reading run log line: {line!r}")
+                utility.log_error(e)
+
+    def __iter__(self) -> Iterator[dict]:
+        with open(self.path, "rb") as log_file:
+            yield from self.__parse(log_file)
+
+    def iter_from(self, i: int) -> Iterator[dict]:
+        """
+        the runs from a run number onwards, read in one pass
+        """
+        if i >= len(self):
+            return
+        with open(self.index_path, "rb") as index_file:
+            offset = self.__offset(index_file, i)
+        with open(self.path, "rb") as log_file:
+            log_file.seek(offset)
+            yield from self.__parse(log_file)
+
+    def __reversed__(self) -> Iterator[dict]:
+        """
+        the runs, most recent first.  Reads one run at a time, so stopping early
+        doesn't read the whole log.
+        """
+        for i in range(len(self) - 1, -1, -1):
+            try:
+                yield self[i]
+            except ValueError:
+                continue
+
+    def append(self, run: dict) -> None:
+        self.extend((run,))
+
+    def extend(self, runs: Iterable[dict]) -> None:
+        with open(self.path, "ab") as log_file, open(self.index_path, "ab") as index_file:
+            offset = log_file.tell()
+            for run in runs:
+                line = json.dumps(run).encode() + b"\n"
+                log_file.write(line)
+                index_file.write(offset.to_bytes(OFFSET_SIZE, "little"))
+                offset += len(line)
+
+    def clear(self) -> None:
+        for path in (self.path, self.index_path):
+            open(path, "wb").close()
+
+    def check(self) -> None:
+        """
+        makes sure the index covers every run in the log, reindexing from the
+        last good run if it doesn't (for instance if the game closed between
+        writing a run and indexing it).  A last line without a newline was cut
+        off while being written, so it is removed, and the next run starts on a
+        line of its own.  Only reads past the last indexed run.
+        """
+        if not os.path.exists(self.path):
+            self.clear()
+            return
+        size = os.path.getsize(self.path)
+        length = len(self)
+        cut_at: int | None = None
+        with open(self.index_path, "ab+") as index_file, open(self.path, "rb") as log_file:
+            start = 0
+            if length > 0:
+                start = self.__offset(index_file, length - 1)
+                if start >= size:  # the index is ahead of the log, so it can't be trusted
+                    start = length = 0
+            log_file.seek(start)
+            if length > 0 and not log_file.readline().endswith(b"\n"):
+                cut_at = start
+                length -= 1
+            index_file.truncate(length * OFFSET_SIZE)
+            offset = log_file.tell()
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    cut_at = offset
+                    break
+                if line.strip():
+                    index_file.write(offset.to_bytes(OFFSET_SIZE, "little"))
+                offset += len(line)
+        if cut_at is not None:
+            with open(self.path, "ab") as log_file:
+                log_file.truncate(cut_at)
+
+    def truncate(self, size: int) -> None:
+        """
+        cuts the log back to a size in bytes, which must be where a run ends,
+        and reindexes it
+        """
+        with open(self.path, "ab") as log_file:
+            log_file.truncate(size)
+        self.check()
+
+    def migrate(self, old_path: str = OLD_LOG_PATH) -> int:
+        """
+        moves runs from the old text log into this one.  If a move was
+        interrupted, the runs it added are removed and it is done again, so no
+        run is added twice.
+        :return: how many runs were moved
+        """
+        from general_use import utility
+        marker_path = old_path + ".migrating"
+        if os.path.exists(marker_path):
+            if not os.path.exists(old_path):
+                # the old log was renamed, so the move finished
+                os.remove(marker_path)
+                return 0
+            with open(marker_path, "r") as marker:
+                self.truncate(int(marker.read()))
+        elif not os.path.exists(old_path):
+            return 0
+        else:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            with open(marker_path + ".tmp", "w") as marker:
+                marker.write(str(size))
+            os.replace(marker_path + ".tmp", marker_path)
+        runs = []
+        with open(old_path, "r") as old_file:
+            for line in old_file:
+                if not line.strip():
+                    continue
+                try:
+                    runs.append(ast.literal_eval(line))
+                except (ValueError, SyntaxError) as e:
+                    e.add_note(f"Occurred while moving old run log line: {line}")
+                    utility.log_error(e)
+        self.extend(runs)
+        os.replace(old_path, old_path + ".migrated")
+        os.remove(marker_path)
+        return len(runs)
+
+
+def open_log() -> RunLog:
+    """
+    the run log, checked and with any old log moved into it
+    """
+    log = RunLog()
+    log.check()
+    log.migrate()
+    return log
@@ -192,6 +192,17 @@ def outline_img(img: pygame.Surface, outline: int, outline_type: OutlineTypes |
     return outlining
 
 
+def union_rects(a: pygame.Rect | None, b: pygame.Rect | None) -> pygame.Rect | None:
+    """
+    the union of two rects, either of which may be missing
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a.union(b)
+
+
 def make_flashing_img(img: pygame.Surface):
     if img is None:
         return None
@@ -293,7 +304,7 @@ def make_async(
     return inner_make_async
 
 
-from general_use import game_structures
+from general_use import game_structures, frame_timing
 import pygame
 from data import game_states
 
@@ -397,6 +408,26 @@ __fps = None
 __millisecond_target = None
 
 
+def set_backdrop(color: tuple[int, int, int] | None):
+    """
+    sets what the screen is cleared to before each frame is drawn.  If None, the
+    screen isn't cleared.
+    """
+    global __backdrop
+    __backdrop = color
+
+
+__backdrop: tuple[int, int, int] | None = None
+
+
+def clear_screen(area: pygame.Rect | None = None) -> None:
+    """
+    :param area: the part of the screen to clear.  Defaults to all of it
+    """
+    if __backdrop is not None:
+        game_structures.SCREEN.fill(__backdrop, area)
+
+
 def set_game_tick(game_tick: Callable[[], None]):
     global __game_tick
     __game_tick = game_tick
@@ -434,6 +465,9 @@ def dump_times():
 
 def tick() -> None:
     global __debugging, __debugged_fps, __debug_start_time, __past_debugged_ticks, __debug_profile
+    if not (game_states.PLACE is not None and game_states.PLACE.static):
+        # static places only clear the screen when something changes
+        clear_screen()
     if __debugging:
         __debugged_fps += 1
         with __debug_profile:
@@ -442,8 +476,8 @@ def tick() -> None:
     else:
         __game_tick()
         __tick()
-    milliseconds = game_structures.CLOCK.tick(__fps)
-    if __debug_low_fps:
+    milliseconds = game_structures.CLOCK.tick() if __fps is None else game_structures.CLOCK.tick(__fps)
+    if __debug_low_fps and __millisecond_target is not None:  # there's no target when running uncapped
         over_target = milliseconds > __millisecond_target
         __past_debugged_ticks.rotate(1)
         __past_debugged_ticks[0] = over_target
@@ -470,8 +504,11 @@ def end_print_debug():
         dump_times()
 
 
+__last_alert_rect: pygame.Rect | None = None
+
+
 def __tick() -> None:
-    global button_hover_keyed, keyed_down, mouse_down
+    global button_hover_keyed, keyed_down, mouse_down, __last_alert_rect
     """
     function that handles game clock and frame rate
     also handles some other actions that need to happen every frame
@@ -481,13 +518,41 @@ def __tick() -> None:
     if game_structures.TRUE_SCREEN is not None:
         factor = game_states.HEIGHT / game_structures.TRUE_HEIGHT
         mouse_pos = (mouse_pos[0] * factor, mouse_pos[1] * factor)
-    game_structures.BUTTONS.render_onto(game_structures.SCREEN, mouse_pos)
+    static = game_states.PLACE is not None and game_states.PLACE.static
+    if static:
+        # only redraw where buttons changed
+        dirty = game_structures.BUTTONS.dirty_rect(mouse_pos)
+        if game_structures.REDRAW_ALL:
+            dirty = game_structures.SCREEN.get_rect()
+    else:
+        dirty = None
+    game_structures.REDRAW_ALL = not static
+    frame_timing.begin()
     alert_img = game_structures.ALERTS.tick()
+    frame_timing.lap("alerts")
     if alert_img is not None:
-        game_structures.SCREEN.blit(
-            alert_img,
-            (game_states.WIDTH // 2 - game_structures.ALERTS.width // 2, 0)
-        )
+        alert_rect = alert_img.get_rect(topleft=(game_states.WIDTH // 2 - game_structures.ALERTS.width // 2, 0))
+        dirty = union_rects(dirty, union_rects(__last_alert_rect, alert_rect))
+    else:
+        alert_rect = None
+        dirty = union_rects(dirty, __last_alert_rect)
+    __last_alert_rect = alert_rect
+    dirty = union_rects(dirty, frame_timing.update_overlay())
+    if static and dirty is None:
+        # nothing on screen changed, so skip drawing
+        frame_timing.lap("buttons")
+    else:
+        if static:
+            # everything drawn is inside the dirty area, so nothing else is touched
+            game_structures.SCREEN.set_clip(dirty)
+            clear_screen(dirty)
+        game_structures.BUTTONS.render_onto(game_structures.SCREEN, mouse_pos)
+        frame_timing.lap("buttons")
+        if alert_img is not None:
+            game_structures.SCREEN.blit(alert_img, alert_rect)
+        frame_timing.draw_overlay()
+        if static:
+            game_structures.SCREEN.set_clip(None)
 
     if keyed_down:
         if pygame.key.get_pressed()[special_key]:
@@ -542,6 +607,9 @@ def __tick() -> None:
                     keyed_down = True
                     game_structures.BUTTONS.do_key(game_structures.Button.ClickTypes.down)
                 game_structures.BUTTONS.special_key_click(event.key)
+                if game_states.ADMIN and event.key == frame_timing.OVERLAY_KEY:
+                    event_handled = True
+                    frame_timing.toggle_overlay()
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:
                 mouse_down = True
@@ -555,4 +623,7 @@ def __tick() -> None:
                 if catcher(event):
                     break
 
-    game_structures.display_screen()
+    if not static:
+        game_structures.display_screen()
+    elif dirty is not None:
+        game_structures.display_rects([dirty.clip(game_structures.SCREEN.get_rect())])
@@ -20,6 +20,7 @@ main ran file for the game
 import argparse
 import cProfile
 import ast
+import os
 import time
 
 import pygame
@@ -39,12 +40,12 @@ utility.set_fps(60)
 def run():
     game_states.SEED = int(time.time()) % 256 ** 8
 
+    utility.set_backdrop(backdrop)
     game_structures.switch_to_place(game_structures.PLACES.main)
 
     while game_states.RUNNING:  # outer loop only for when the try except successfully handles it
         try:  # try catch to see if the area knows how to handle the error
             while game_states.RUNNING:  # main loop
-                game_structures.SCREEN.fill(backdrop)
                 utility.tick()
             game_states.PLACE.exit()
         except Exception as E:
@@ -56,6 +57,24 @@ def run():
     pygame.quit()
 
 
+def run_headless():
+    from run_game import headless
+    headless.run(args.ticks, args.seed, args.script)
+    pygame.quit()
+
+
+def run_replay():
+    from run_game import replay
+    replay.play(args.replay)
+    pygame.quit()
+
+
+def run_benchmark():
+    from run_game import benchmark
+    benchmark.run(args.count)
+    pygame.quit()
+
+
 def int_tuple_from_string(num_args: int, argname: str, value_range: tuple[int | None, int | None] = (None, None)):
     def inner(string: str):
         try:
@@ -81,7 +100,7 @@ def int_tuple_from_string(num_args: int, argname: str, value_range: tuple[int |
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog="Down The Line")
     parser.add_argument(
-        "mode", default="play", choices=["testing", "test_images", "play"], nargs="?",
+        "mode", default="play", choices=["testing", "test_images", "play", "headless", "replay", "benchmark"], nargs="?",
         help="The mode for the program to run in."
     )
     parser.add_argument(
@@ -110,6 +129,26 @@ if __name__ == "__main__":
         type=int_tuple_from_string(3, "backdrop", (0, 255)), default=None,
         help="Set the backdrop color for the game.  Useful, occasionally, for testing purposes."
     )
+    parser.add_argument(
+        "-t", "--ticks", type=int, default=36000,
+        help="How many ticks to simulate in headless mode."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="The seed for the first run in headless mode.  Later runs use the following seeds."
+    )
+    parser.add_argument(
+        "--script", default=None,
+        help="A file of input steps to loop through in headless mode, one (ticks, held, pressed) tuple per line."
+    )
+    parser.add_argument(
+        "-r", "--replay", default=None,
+        help="The replay file to play back in replay mode."
+    )
+    parser.add_argument(
+        "-n", "--count", type=int, default=1000,
+        help="How many entities and particles to make in benchmark mode."
+    )
     args = parser.parse_args()
 
     __run = True
@@ -125,6 +164,27 @@ if __name__ == "__main__":
         __run = False
     elif args.mode == "play":
         backdrop = (0, 0, 0)
+    elif args.mode == "headless":
+        backdrop = (0, 0, 0)
+        dimens = (1000, 700)
+        prompt = "run_headless"
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    elif args.mode == "replay":
+        if args.replay is None:
+            parser.error("replay mode needs a replay file (--replay)")
+        from run_game import replay
+        backdrop = (0, 0, 0)
+        dimens = replay.read_header(args.replay)[1]
+        prompt = "run_replay"
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    elif args.mode == "benchmark":
+        backdrop = (0, 0, 0)
+        dimens = (1000, 700)
+        prompt = "run_benchmark"
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 
     if __run:
         game_states.PRINT_SEED = args.print_seed
@@ -0,0 +1,102 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+measures how much memory entities and particles take, and how fast the
+gameboard's per-tick loops go through them.  For checking changes to how they
+are laid out.
+"""
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+import pygame
+
+from run_game import entities, gameboard, particles
+
+
+class BenchmarkEntity(entities.Entity):
+    """
+    an entity with nothing of its own, so only the base entity is measured
+    """
+
+
+def average_size(make: Callable[[int], object], count: int) -> float:
+    """
+    the average memory taken by each object made, in bytes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    made = [make(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del made
+    return size / count
+
+
+def rate(func: Callable[[], None], repeats: int) -> float:
+    """
+    how many times a second a function can run
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return repeats / (time.perf_counter() - start)
+
+
+def run(count: int, repeats: int = 200) -> None:
+    """
+    benchmarks a board of entities and a batch of particles, then reports
+    :param count: how many entities and particles to make
+    :param repeats: how many times each loop is timed
+    """
+    rand = random.Random(0)
+    img = pygame.Surface((40, 60))
+    kind = particles.ParticleKind([pygame.Surface((4, 4))], 1)
+
+    def make_entity(i: int) -> BenchmarkEntity:
+        return BenchmarkEntity(img, 0, (0, rand.randint(0, 100 * count)))
+
+    entity_size = average_size(make_entity, count)
+    particle_size = average_size(lambda i: entities.Particle(kind, 100, (0, i)), count)
+
+    board = gameboard.EntityBoard([make_entity(i) for i in range(count)])
+    board.resort()
+
+    def read_all() -> None:
+        for e in board:
+            e.x, e.y
+
+    moves = [rand.randint(-5, 5) for _ in range(count)]
+
+    def move_all() -> None:
+        for e, move in zip(board, moves):
+            e.y += move
+
+    def move_and_resort() -> None:
+        move_all()
+        board.resort()
+
+    print(
+        f"Entity: {entity_size:.0f} bytes, particle: {particle_size:.0f} bytes\n"
+        f"Over {count} entities, per second:\n"
+        f"    reading every position: {rate(read_all, repeats):.0f}\n"
+        f"    moving every entity: {rate(move_all, repeats):.0f}\n"
+        f"    moving and sorting the board: {rate(move_and_resort, repeats):.0f}",
+        flush=True
+    )
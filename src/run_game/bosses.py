@@ -22,7 +22,7 @@ import functools
 import math
 import random
 
-from run_game import entities, gameboard
+from run_game import entities, gameboard, particles
 from data import images, game_states
 import pygame
 from general_use import game_structures, utility
@@ -515,6 +515,8 @@ class Serpent(Boss):
 
 class SerpentDeathHandler(entities.InvulnerableEntity):
 
+    cull_offscreen = False
+
     @property
     def alive(self) -> bool:
         return len(self.serpent.parts) > 0
@@ -528,6 +530,8 @@ class SerpentDeathHandler(entities.InvulnerableEntity):
         self.slow_progress = 0
         self.slow_increase_delay = 1  # proper ticks between a slow increase
         self.slow_increase_progress = 0
+        # the particles left by each segment image at each rotation
+        self.kinds: dict[pygame.Surface, particles.ParticleKind] = dict()
 
     def tick(self):
         if self.slow_progress >= self.slow:
@@ -577,11 +581,16 @@ class SerpentDeathHandler(entities.InvulnerableEntity):
             rads = math.radians((body_part.rotation + 180) % 360)
             momentum = (round(self.serpent.speed * math.sin(rads) / self.slow), -round(self.serpent.speed * math.cos(rads) / self.slow))
             # if I want to add break-apart stuff to the particles, need to get the original image, somehow
+            kind = self.kinds.get(body_part.img)
+            if kind is None:
+                kind = self.kinds[body_part.img] = particles.ParticleKind(
+                    imgs=[body_part.img],
+                    tick_rate=1000,
+                    radius=body_part.radius()
+                )
             gameboard.PARTICLE_BOARD.add(entities.Particle(
-                imgs=[body_part.img],
-                tick_rate=1000,
+                kind,
                 lifespan=30,
-                radius=body_part.radius(),
                 pos=body_part.pos,
                 momentum=momentum
             ))
@@ -18,16 +18,17 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 describing most non-player entities.  Items and ability drops are not considered
 entities
 """
+import bisect
 import weakref
 
 import pygame
 
-from run_game import abilities, ingame, gameboard
+from run_game import abilities, ingame, gameboard, particles
 from data import game_states, images
 from general_use import game_structures, utility
 import random
 import math
-from typing import Type, Iterable, Self, Callable, Literal, Generator, Any
+from typing import Type, Iterable, Self, Callable, Literal, Generator, Any, Iterator
 
 
 def glide_player(speed: int, duration: int, taper: int, direction: int):
@@ -39,15 +40,127 @@ def glide_player(speed: int, duration: int, taper: int, direction: int):
     )
 
 
+class InstanceRegistry:
+    """
+    the loaded instances of an entity class that tracks instances, in the order
+    they were loaded.  Adding and removing don't search.  Also keeps their ys
+    sorted for range queries, sorted again at most once per sort of the
+    gameboard.
+    """
+
+    def __init__(self):
+        self.entities: dict["Entity", None] = dict()
+        self.__sorted_at: int | None = None  # gameboard.ENTITY_BOARD.sorts when last sorted
+        self.__ys: list[int] = []
+
+    def add(self, entity: "Entity") -> None:
+        self.entities[entity] = None
+        self.__sorted_at = None
+
+    def remove(self, entity: "Entity") -> None:
+        del self.entities[entity]
+        self.__sorted_at = None
+
+    def clear(self) -> None:
+        self.entities.clear()
+        self.__sorted_at = None
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def ys(self) -> list[int]:
+        """
+        the y of each instance, sorted
+        """
+        if self.__sorted_at != gameboard.ENTITY_BOARD.sorts:
+            self.__ys = sorted(e.y for e in self.entities)
+            self.__sorted_at = gameboard.ENTITY_BOARD.sorts
+        return self.__ys
+
+    def any_between(self, low: int, high: int, inclusive: bool = False) -> bool:
+        """
+        if any instance is between two y values
+        """
+        ys = self.ys()
+        if inclusive:
+            i = bisect.bisect_left(ys, low)
+            return i < len(ys) and ys[i] <= high
+        i = bisect.bisect_right(ys, low)
+        return i < len(ys) and ys[i] < high
+
+
+class Pooled:
+    """
+    mixin for entities that are made and thrown away often.  Once one is off the
+    gameboard it is kept in a pool for its class, and making a new entity of that
+    class takes one from the pool, resets it, and runs __init__ on it again,
+    instead of making a new object.
+
+    Only for entities that being hit does nothing to, like lazers and their
+    ends.  Hit caches (like a swing's list of what it has hit) compare entities
+    by identity, so a reused entity is immune to anything that hit the entity it
+    used to be.
+    """
+
+    __slots__ = ()
+
+    # how many entities of a class are kept.  0 turns pooling off for a class
+    pool_size: int = 64
+
+    __pools: dict[type, list] = dict()
+
+    def __new__(cls, *args, **kwargs):
+        # entities are made on the area generator's thread as well as the main
+        # one, so the pool can empty between checking it and taking from it.
+        # list.pop is atomic, so just try it
+        try:
+            entity = Pooled.__pools[cls].pop()
+        except (KeyError, IndexError):
+            return super().__new__(cls)
+        entity.reset()
+        return entity
+
+    def reset(self) -> None:
+        """
+        gets a pooled entity ready for __init__ to run on it again.  Everything
+        not in a slot is forgotten, and __init__ sets all the slots again.
+        """
+        self.__dict__.clear()
+
+    def recycle(self) -> None:
+        """
+        puts the entity in its pool.  Only for entities that are entirely off
+        the gameboard, since it will be reused.
+        """
+        pool = Pooled.__pools.setdefault(type(self), [])
+        if len(pool) < self.pool_size:
+            pool.append(self)
+
+    @staticmethod
+    def clear_pools() -> None:
+        Pooled.__pools.clear()
+
+
 class Entity(game_structures.Body):
     """
     base entity class that describes a few things most entities need to do
     """
 
-    biggest_radius: int = 0
+    __slots__ = (
+        "index", "__offset", "__health", "max_health", "flashing",
+        "__x_shake_momentum", "__x_shake", "__y_shake_momentum", "__y_shake", "__shake_limit",
+    )
+
+    # if the entity is on gameboard.ENTITY_BOARD, which counts its radius
+    on_board: bool = False
+    # if the entity has been taken off the gameboard, and should be swept off
+    # of gameboard.DRAW_ENTITY_BOARD
+    discarded: bool = False
 
-    __instances: list | set | None = None
-    __add_instance: Callable[[Self], None] | None = None
+    __instances: InstanceRegistry | None = None
     seen: bool = False
     first_occurs: int = 0
     tutorial_given: bool = False
@@ -68,6 +181,9 @@ class Entity(game_structures.Body):
     immune_collide_below: int = 0
 
     draw_priority = 0
+    # if the entity can be skipped when drawing while offscreen.  Turn off for
+    # entities that draw things far away from themselves
+    cull_offscreen: bool = True
 
     @property
     def alive(self) -> bool:
@@ -161,8 +277,7 @@ class Entity(game_structures.Body):
 
         if track_instances:
             cls.track_instances = True
-            cls.__instances = list()
-            cls.__add_instance = cls.__instances.append
+            cls.__instances = InstanceRegistry()
         super().__init_subclass__()
 
     @classmethod
@@ -251,7 +366,7 @@ class Entity(game_structures.Body):
         :return:
         """
         if self.track_instances:
-            self.__add_instance(self)
+            self.__instances.add(self)
         if not type(self).seen:
             type(self).seen = True
             self.first_seen()
@@ -276,11 +391,12 @@ class Entity(game_structures.Body):
         """
         if pos is None:
             pos = game_states.DISTANCE
-        return any((e.y < pos) == (e.y > self.y) for e in entity_type.instances())
-        # for e in entity_type.instances():
-        #     if (e.y < pos) == (e.y > self.y):
-        #         return True
-        # return False
+        if not entity_type.track_instances:
+            return False
+        # can be up to a tick behind, like other range queries
+        if self.y < pos:
+            return entity_type.__instances.any_between(self.y, pos)
+        return entity_type.__instances.any_between(pos, self.y, inclusive=True)
 
     def in_view(self, margin: int = 0) -> bool:
         return self.distance_to_view_edge() > margin
@@ -303,9 +419,9 @@ class Entity(game_structures.Body):
             self.__offset += 1
             if self.index + self.__offset >= len(gameboard.ENTITY_BOARD):
                 return None
-            entity = gameboard.ENTITY_BOARD[self.index + self.__offset]
-            if limit is not None and entity.y - self.y > limit:
+            if limit is not None and gameboard.ENTITY_BOARD.ys[self.index + self.__offset] - self.y > limit:
                 return None
+            entity = gameboard.ENTITY_BOARD[self.index + self.__offset]
             if accept_func(entity):
                 return entity
 
@@ -318,9 +434,9 @@ class Entity(game_structures.Body):
             self.__offset -= 1
             if self.index + self.__offset < 0:
                 return None
-            entity = gameboard.ENTITY_BOARD[self.index + self.__offset]
-            if limit is not None and self.y - entity.y > limit:
+            if limit is not None and self.y - gameboard.ENTITY_BOARD.ys[self.index + self.__offset] > limit:
                 return None
+            entity = gameboard.ENTITY_BOARD[self.index + self.__offset]
             if accept_func(entity):
                 return entity
 
@@ -329,25 +445,45 @@ class Entity(game_structures.Body):
             _range: int,
             accept_func: Callable[[Self], bool] = utility.make_simple_always(True)
     ) -> Generator[Self, Any, None]:
-        low = self.index
-        while low >= 0 and self.y - gameboard.ENTITY_BOARD[low].y < _range:
-            low -= 1
-        low += 1
-        high = self.index
-        while high < len(gameboard.ENTITY_BOARD) and gameboard.ENTITY_BOARD[high].y - self.y < _range:
-            high += 1
-        return (gameboard.ENTITY_BOARD[i] for i in range(low, high) if gameboard.ENTITY_BOARD[i] is not self and accept_func(gameboard.ENTITY_BOARD[i]))
-
-    def colliding(self, additional_predicate: Callable[[Self], bool] = None) -> Generator[Self, Any, None]:
+        board = gameboard.ENTITY_BOARD
+        y = self.y
+        low, high = board.range_indices(y - _range, y + _range)
+        return (
+            board[i] for i in range(low, high)
+            if abs(board[i].y - y) < _range and board[i] is not self and accept_func(board[i])
+        )
+
+    def all_within(
+            self,
+            reach: int,
+            accept_func: Callable[[Self], bool] = utility.make_simple_always(True)
+    ) -> Generator[Self, Any, None]:
+        """
+        all entities that could come within a distance of this one, counting
+        their radius.  Only reaches as far as the biggest radius on the board
+        """
+        board = gameboard.ENTITY_BOARD
+        y = self.y
+        low, high = board.range_indices(y - reach - board.biggest_radius(), y + reach + board.biggest_radius())
+        return (
+            board[i] for i in range(low, high)
+            if abs(board[i].y - y) < reach + board[i].radius() and board[i] is not self and accept_func(board[i])
+        )
+
+    def radius_changed(self, old: int, new: int) -> None:
+        if self.on_board:
+            gameboard.ENTITY_BOARD.radius_changed(old, new)
+
+    def colliding(self, additional_predicate: Callable[[Self], bool] = None) -> Iterator[Self]:
         predicate = (
-            lambda e: self.collide_priority >= e.immune_collide_below and self.collide(e)
+            lambda e: self.collide_priority >= e.immune_collide_below
         ) if additional_predicate is None else (
-            lambda e: self.collide_priority >= e.immune_collide_below and additional_predicate(e) and self.collide(e)
+            lambda e: self.collide_priority >= e.immune_collide_below and additional_predicate(e)
         )
-        return self.all_in_range(
-            self.height // 2 + Entity.biggest_radius,
+        return iter(self.collide_all(self.all_within(
+            self.height // 2,
             accept_func=predicate
-        )
+        )))
 
     def exclude_wall_safe(
             self,
@@ -373,7 +509,7 @@ class Entity(game_structures.Body):
                 else:
                     self.y += round(math.copysign(self.height // 2, push_factor))
         e: Entity
-        for e in filter(self.collide, collide_list):
+        for e in self.collide_all(collide_list):
             run_on_hit(e)
         for e in filter(self.collide, displace_list):
             e.y = self.y + (self.rect.height // 2 + e.rect.height // 2) * ((e.y - self.y > 0) * 2 - 1)
@@ -574,7 +710,7 @@ class ItemEntity(InvulnerableEntity):
     @property
     def img(self):
         if self._rotated_img is None and self.item.img is not None:
-            self._rotated_img = pygame.transform.rotate(self.item.img, self.__rotation)
+            self._rotated_img = game_structures.ROTATIONS.rotate(self.item.img, self.__rotation)
         return self._rotated_img
 
     @img.setter
@@ -1313,14 +1449,44 @@ class Knight(Glides, CarriesItems):
         self.max_health = 20
         self.health = 20
         self.step = None
+        self.canvas: pygame.Surface | None = None
 
-    def draw(self):
+    """
+    composite images, shared by every knight, keyed by the step frame and the
+    overlay of each hand in use (with whether it is flipped), in drawing order
+    """
+    composites: dict[tuple, pygame.Surface] = dict()
+
+    @classmethod
+    def composite(cls, step: pygame.Surface | None, overlays: tuple[tuple[pygame.Surface, bool], ...]) -> pygame.Surface:
+        key = (step, overlays)
+        canvas = cls.composites.get(key)
+        if canvas is not None:
+            return canvas
         canvas = pygame.Surface((64, 64), flags=pygame.SRCALPHA)
-        if self.step is not None:
+        if step is not None:
             canvas.blit(
-                self.step,
+                step,
+                (0, 0)
+            )
+        for hand_drawing, flip in overlays:
+            canvas.blit(
+                pygame.transform.flip(
+                    hand_drawing,
+                    flip,
+                    False
+                ),
                 (0, 0)
             )
+        canvas.blit(
+            images.KNIGHT_TOP.img,
+            (0, 0)
+        )
+        cls.composites[key] = canvas
+        return canvas
+
+    def draw(self):
+        overlays = []
         for hand in self.hands:
             if hand is None:
                 continue
@@ -1334,19 +1500,12 @@ class Knight(Glides, CarriesItems):
                 hand_drawing = self.shielding.img
             if hand_drawing is None:
                 continue
-            canvas.blit(
-                pygame.transform.flip(
-                    hand_drawing,
-                    hand.pos[1] == 0,
-                    False
-                ),
-                (0, 0)
-            )
-        canvas.blit(
-            images.KNIGHT_TOP.img,
-            (0, 0)
-        )
-        self.img = canvas
+            overlays.append((hand_drawing, hand.pos[1] == 0))
+        canvas = Knight.composite(self.step, tuple(overlays))
+        if canvas is not self.canvas:
+            # only swap images when the look changes, so rotations and flashing stay cached
+            self.canvas = canvas
+            self.img = canvas
         Glides.draw(self)
 
     def tick(self) -> bool:
@@ -1409,6 +1568,8 @@ class Knight(Glides, CarriesItems):
             pygame.transform.flip(images.KNIGHT_STEP_2.img, True, False),
             pygame.transform.flip(images.KNIGHT_STEP_1.img, True, False),
         ]
+        # the step frames are new, so composites made from the old ones won't be used again
+        Knight.composites.clear()
 
     def final_load(self):
         super().final_load()
@@ -1425,7 +1586,7 @@ class Knight(Glides, CarriesItems):
         return making
 
 
-class Lazer(InvulnerableEntity):
+class Lazer(Pooled, InvulnerableEntity):
     """
     a lazer that can hurt the player.  Stationary.
     Superclass, can be subclassed to add/replace ends, ends should be registered pre super call
@@ -1434,6 +1595,8 @@ class Lazer(InvulnerableEntity):
     TOP = object()
     BOTTOM = object()
 
+    cull_offscreen = False
+
     @staticmethod
     def _to_y(y: int | Literal[TOP, BOTTOM]):
         if y is Lazer.BOTTOM:
@@ -1680,6 +1843,9 @@ class PathedLazer(Lazer):
 
 class RotatingLazer(Lazer):
 
+    # bosses keep hold of their lazers
+    pool_size = 0
+
     def __init__(
             self, rotation: float, radius: float, points: int, pos: tuple[int, int], charge_time: int, duration: int,
             seed, damage: int = 1, halt_dashes: bool = False
@@ -1708,7 +1874,7 @@ class RotatingLazer(Lazer):
         super().tick()
 
 
-class ComponentEntity(Entity):
+class ComponentEntity(Pooled, Entity):
     """
     Any entity that is only a component of another, larger body.  Like lazer ends.
     All work should be done in the 'brains' entity
@@ -2211,7 +2377,7 @@ class KnockbackHolder(InvulnerableGlides, InvulnerableHolder):
 
     def on_stop_gliding(self):
         self.holding.index = self.index
-        gameboard.ENTITY_BOARD[self.index] = self.holding
+        gameboard.ENTITY_BOARD.replace(self.index, self.holding)
 
     # idk why this is necessary
     def draw(self):
@@ -2381,8 +2547,8 @@ class Bomb(InvulnerableGlides):
                 self.x - self.size // 2, self.y - self.size // 2,
                 self.size, self.size
             )
-            damaging = tuple(self.all_in_range(
-                    Entity.biggest_radius + self.size,
+            damaging = tuple(self.all_within(
+                    self.size,
                     accept_func=lambda e: colliding.colliderect(e.rect)
             ))
             if damaging and self.allied_with_player:
@@ -2620,75 +2786,29 @@ class MassDelayedDeploy(InvulnerableEntity):
 
 class Particle:
     """
-    a basic particle.  Just an image onscreen.
+    a basic particle.  Just an image onscreen.  Added to a particle pool, which
+    ticks and draws it.
     """
 
-    __id = 0
+    __slots__ = ("kind", "x", "y", "momentum", "lifespan")
 
-    def __init__(self, imgs: list[images.Image] | list[pygame.Surface], tick_rate: int, lifespan: int, radius: int, pos: tuple[int, int], momentum: tuple[int, int] = (0, 0), rotation: int = 0):
-        self.imgs: list[pygame.Surface] = imgs
-        if isinstance(self.imgs[0], images.Image):
-            for i in range(len(self.imgs)):
-                self.imgs[i] = self.imgs[i].img
-        self.__radius = radius
-        self.rotation = rotation
-        self.img = self.imgs[0]
+    def __init__(self, kind: particles.ParticleKind, lifespan: int, pos: tuple[int, int], momentum: tuple[int, int] = (0, 0)):
+        self.kind: particles.ParticleKind = kind
         self.x, self.y = pos
-        self.ticks_per_frame_change = tick_rate
-        self.frame_loop = len(self.imgs) * tick_rate
-        self.frame = 0
         self.momentum = momentum
         self.lifespan = lifespan
-        self.__id = Particle.__id
-        Particle.__id += 1
-
-    def tick(self):
-        self.lifespan -= 1
-        self.frame = (self.frame + 1) % self.frame_loop
-        self.img = self.imgs[self.frame // self.ticks_per_frame_change]
-        self.x += self.momentum[0]
-        self.y += self.momentum[1]
-        return self.lifespan > 0
-
-    def draw(self):
-        if game_states.CAMERA_BOTTOM - self.__radius < game_states.DISTANCE < game_states.CAMERA_BOTTOM + game_states.HEIGHT + self.__radius:
-            img = self._rotated_img
-            if img is None:
-                return
-            game_structures.SCREEN.blit(
-                img,
-                (
-                    game_structures.to_screen_x(self.x) - img.get_width() // 2,
-                    game_structures.to_screen_y(self.y) - img.get_height() // 2
-                )
-            )
-        return self.x, self.y
-
-    def reset_id_check(self):
-        if self.__id == 10000:
-            Particle.__id = 0
-
-    def __hash__(self):
-        return self.__id
-
-    @property
-    def img(self):
-        return self._rotated_img
-
-    @img.setter
-    def img(self, val: pygame.Surface):
-        if isinstance(val, images.Image):
-            val = val.img
-        self._rotated_img = pygame.transform.rotate(val, self.rotation)
 
 
 def particle_with_settings(imgs: list[pygame.Surface] | list[images.Image], tick_rate: int, lifespan: int):
-    def radius_helper(img) -> int:
-        if isinstance(img, images.Image):
-            img = img.img
-        return math.isqrt(img.get_width() ** 2 + img.get_height() ** 2) // 2
-    radius = max(radius_helper(img) for img in imgs)
-    return lambda pos, momentum = (0, 0), rotation = 0: Particle(imgs, tick_rate, lifespan, radius, pos, momentum, rotation)
+    # pre-rotated kinds for each rotation used so far, to the nearest degree
+    kinds: dict[int, particles.ParticleKind] = dict()
+
+    def make(pos: tuple[int, int], momentum: tuple[int, int] = (0, 0), rotation: int = 0) -> Particle:
+        rotation = round(rotation) % 360
+        if rotation not in kinds:
+            kinds[rotation] = particles.ParticleKind(imgs, tick_rate, rotation=rotation)
+        return Particle(kinds[rotation], lifespan, pos, momentum)
+    return make
 
 
 VOID_PARTICLES = particle_with_settings(images.VOID_PARTICLES, 30, 120)
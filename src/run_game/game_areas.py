@@ -23,10 +23,12 @@ import random
 import pygame
 
 from data import game_states, images, switches
-from run_game import tutorials, entities, bosses, items, gameboard
-from general_use.utility import make_async, add_error_checking, make_simple_always
+from run_game import tutorials, entities, bosses, items, gameboard, particles
+from general_use.utility import log_error, make_simple_always
 from general_use import game_structures
 import math
+import queue
+import threading
 from collections import deque
 from typing import Type, Iterable, Callable, Any
 
@@ -74,7 +76,7 @@ class GameArea:
         self.boundary_crossed: bool = False
         self.entity_list: list[entities.Entity] | None = []
         self.particle_maker: Callable[[tuple[int, int]], entities.Particle] = entities.VOID_PARTICLES
-        self.particle_list: set = set()
+        self.particle_list: particles.ParticlePool = particles.ParticlePool()
         if seed is None:
             raise ValueError("I cry non-deterministic from set seed (every random call needs to be deterministic from"
                              "the original seed)")
@@ -143,8 +145,7 @@ class GameArea:
         pass
 
     def draw_particles(self):
-        for particle in self.particle_list:
-            particle.draw()
+        self.particle_list.draw()
 
     def draw(self):
         # if self.player_in():
@@ -185,7 +186,7 @@ class GameArea:
                                 self.taper_length - round(math.sqrt(1 + 8 * self.random.randint(0, (self.taper_length + 1) * self.taper_length // 2) - 1) - 1)
                         ) // 2
                 )))
-            gameboard.particle_set_tick(self.particle_list)
+            self.particle_list.tick()
         # print(len(self.particle_list))
         if not self.boundary_crossed and game_states.DISTANCE > self.start_coordinate:
             self.boundary_crossed = True
@@ -201,16 +202,20 @@ class GameArea:
         """
         pass
 
-    def finalize(self):
+    def finalize(self, camera_bottom: int | None = None):
         """
         called at the end of an intialization.  Ensures that the start
         coordinate is offscreen and moves everything to correct position
 
         DON'T CALL THIS IN __INIT__!!!  Called during add_area().
+        :param camera_bottom: where the camera was when the area was asked for.
+        Defaults to where it is now
         :return:
         """
-        if self.start_coordinate < game_states.CAMERA_BOTTOM + game_states.HEIGHT + 100 or self.start_coordinate < game_states.LAST_AREA_END:
-            self.start_coordinate = max(game_states.CAMERA_BOTTOM + game_states.HEIGHT + 100, game_states.LAST_AREA_END)
+        if camera_bottom is None:
+            camera_bottom = game_states.CAMERA_BOTTOM
+        if self.start_coordinate < camera_bottom + game_states.HEIGHT + 100 or self.start_coordinate < game_states.LAST_AREA_END:
+            self.start_coordinate = max(camera_bottom + game_states.HEIGHT + 100, game_states.LAST_AREA_END)
         game_states.LAST_AREA_END = self.end_coordinate
         for entity in self.entity_list:
             entity.y += self.start_coordinate
@@ -225,8 +230,7 @@ class GameArea:
         if self.entity_list is not None:
             for entity in self.entity_list:
                 entity.cleanup()
-        for particle in self.particle_list:
-            particle.reset_id_check()
+        self.particle_list.clear()
 
     allowable_thresh_holds = (
         (entities.Slime, 0),
@@ -904,9 +908,12 @@ def get_determiner():
     return new_seed(random.Random(game_states.SEED + game_states.LAST_AREA))
 
 
-@make_async(with_lock=True)
-@add_error_checking
-def add_game_area():
+def make_game_area(camera_bottom: int | None = None):
+    """
+    makes the next area, and adds it to the new areas.  Only called by the area
+    generator.
+    :param camera_bottom: where the camera was when the area was asked for
+    """
     # print(game_states.LAST_AREA)
     area: GameArea
     determinator = get_determiner()
@@ -996,11 +1003,130 @@ def add_game_area():
                 area = area_type(determinator, game_states.LAST_AREA)
                 break
     game_states.LAST_AREA += 1
-    area.finalize()
+    area.finalize(camera_bottom)
     # print(game_states.LAST_AREA_END)
     game_structures.NEW_AREAS.append(area)
 
 
+"""
+how many areas are made ahead of the ones the queue needs, so that a slow area
+is done well before it is loaded
+"""
+PREFETCH_DEPTH = 2
+
+
+class AreaRequest:
+    """
+    a request for the next area, that can be waited on.  Keeps where the camera
+    was when it was made, so that where the area goes doesn't depend on when the
+    generator gets to it.
+    """
+
+    def __init__(self, epoch: int, camera_bottom: int):
+        self.epoch = epoch
+        self.camera_bottom = camera_bottom
+        self.error: Exception | None = None  # why the area couldn't be made, if it couldn't
+        self.__done = threading.Event()
+
+    def finish(self) -> None:
+        self.__done.set()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """
+        waits until the area is made or skipped
+        :return: if it finished
+        """
+        return self.__done.wait(timeout)
+
+
+class AreaGenerator:
+    """
+    makes areas one at a time on a single long-lived worker thread, in the order
+    they were requested.  Areas depend on the state the areas before them left
+    behind, so they are never made in parallel.
+    """
+
+    def __init__(self):
+        self.requests: queue.SimpleQueue[AreaRequest] = queue.SimpleQueue()
+        self.pending: deque[AreaRequest] = deque()  # requests not yet finished, oldest first
+        self.epoch: int = 0
+        self.__making = threading.Lock()
+        self.error: Exception | None = None  # why an area of this run couldn't be made, if one couldn't
+        self.__thread: threading.Thread | None = None
+
+    def request(self) -> AreaRequest:
+        """
+        asks for the next area to be made
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__work, name="area generator", daemon=True)
+            self.__thread.start()
+        request = AreaRequest(self.epoch, game_states.CAMERA_BOTTOM)
+        self.pending.append(request)
+        self.requests.put(request)
+        return request
+
+    def wait_for_next(self) -> None:
+        """
+        waits until the next area is made, or nothing more is being made
+        :raises RuntimeError: if the next area couldn't be made
+        """
+        for request in list(self.pending):
+            request.join()
+            if request.error is not None:
+                raise RuntimeError("The next area couldn't be made") from request.error
+            if game_structures.NEW_AREAS:
+                return
+
+    def reset(self) -> None:
+        """
+        drops every outstanding request, and waits for any area being made to
+        finish, so that a new run can start from clean state
+        """
+        with self.__making:
+            self.epoch += 1
+            self.error = None
+
+    def __work(self):
+        while True:
+            request = self.requests.get()
+            with self.__making:
+                if request.epoch == self.epoch:
+                    if self.error is None:
+                        try:
+                            make_game_area(request.camera_bottom)
+                        except Exception as exc:
+                            # every area after this one depends on it, so none of them can be made
+                            self.error = exc
+                            log_error(exc)
+                            game_structures.ALERTS.add_alert("Error occurred while making an area!  Details added to log.")
+                    request.error = self.error
+            self.pending.popleft()
+            request.finish()
+
+
+AREA_GENERATOR = AreaGenerator()
+
+
+def add_game_area() -> AreaRequest:
+    return AREA_GENERATOR.request()
+
+
+def wanted_areas() -> int:
+    """
+    how many areas should be loaded or waiting to be loaded at once
+    """
+    return game_states.AREA_QUEUE_MAX_LENGTH + PREFETCH_DEPTH
+
+
+def wait_for_next_area() -> None:
+    """
+    waits until the next area is made.  Used when it might need to be loaded, so
+    that runs play out the same regardless of how fast areas are made.
+    """
+    AREA_GENERATOR.wait_for_next()
+
+
 area_thresholds = (
     (BasicArea, 0),  # GOD room (40+) TODO
     (BasicArea, 1),  # player room (20+) TODO
@@ -17,11 +17,12 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 draws, loads, and unloads the game scene.
 """
-from general_use import game_structures
-from collections import deque
+from general_use import game_structures, frame_timing
+import bisect
+import collections
 from run_game.game_areas import add_game_area
 import pygame
-from run_game import abilities, game_areas, ingame, tutorials, entities
+from run_game import abilities, game_areas, ingame, tutorials, entities, particles
 from data import draw_constants, game_states, switches
 from screens import run_start_end
 import math
@@ -158,43 +159,267 @@ steepness: int = 10
 liminal_mass_factor: float = 1 / (2 * (1 / (math.exp(steepness * -0.5) + 1) - 0.5))
 max_tolerance: int = 2
 
-ENTITY_BOARD: list[entities.Entity] = []
-DRAW_ENTITY_BOARD: list[entities.Entity] = []
+"""
+the furthest an entity is expected to move in a tick (a dash).  The board's ys
+are as of the last sort, so range queries reach this much further to find
+entities that have moved since.
+"""
+MAX_TICK_MOVEMENT: int = 25
+
+
+class EntityBoard(list):
+    """
+    the entities in play, kept sorted by y.  Keeps the y of each entity as of the
+    last sort alongside, so it can be binary searched for range queries, and how
+    many entities have each radius, so range queries only need to reach as far
+    as the entities that are actually there.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.ys: list[int] = [e.y for e in self]
+        self.sorts: int = 0  # how many times the board has been sorted, so views sorted alongside it know when to update
+        self.radii: collections.Counter[int] = collections.Counter()
+        self.__biggest_radius: int = 0
+        self.__count(self)
+
+    def __count(self, new) -> None:
+        for e in new:
+            e.on_board = True
+            radius = e.radius()
+            self.radii[radius] += 1
+            if radius > self.__biggest_radius:
+                self.__biggest_radius = radius
+
+    def __uncount(self, old) -> None:
+        for e in old:
+            e.on_board = False
+            radius = e.radius()
+            self.radii[radius] -= 1
+            if not self.radii[radius]:
+                del self.radii[radius]
+                if radius == self.__biggest_radius:
+                    self.__biggest_radius = max(self.radii, default=0)
+
+    def radius_changed(self, old: int, new: int) -> None:
+        """
+        moves an entity on the board from one radius to another
+        """
+        self.radii[new] += 1
+        if new > self.__biggest_radius:
+            self.__biggest_radius = new
+        self.radii[old] -= 1
+        if not self.radii[old]:
+            del self.radii[old]
+            if old == self.__biggest_radius:
+                self.__biggest_radius = max(self.radii, default=0)
+
+    def biggest_radius(self) -> int:
+        return self.__biggest_radius
+
+    def append(self, entity: entities.Entity) -> None:
+        super().append(entity)
+        self.ys.append(entity.y)
+        self.__count((entity,))
+
+    def extend(self, new: list[entities.Entity]) -> None:
+        super().extend(new)
+        self.ys.extend(e.y for e in new)
+        self.__count(new)
+
+    def clear(self) -> None:
+        self.__uncount(self)
+        super().clear()
+        self.ys.clear()
+
+    def __delitem__(self, key) -> None:
+        self.__uncount(self[key] if isinstance(key, slice) else (self[key],))
+        super().__delitem__(key)
+        del self.ys[key]
+
+    def replace(self, i: int, entity: entities.Entity) -> None:
+        """
+        puts an entity in the place of another on the board
+        """
+        self.__uncount((self[i],))
+        self[i] = entity
+        self.__count((entity,))
+
+    def discard_dead(self) -> list[entities.Entity]:
+        """
+        takes every dead entity off the board, keeping the rest in order
+        :return: the dead entities
+        """
+        dead: list[entities.Entity] = []
+        ys = self.ys
+        l: int = 0
+        for u in range(len(self)):
+            entity = self[u]
+            if entity.alive:
+                self[l] = entity
+                ys[l] = ys[u]
+                entity.index = l
+                l += 1
+            else:
+                dead.append(entity)
+        super().__delitem__(slice(l, None))
+        del ys[l:]
+        self.__uncount(dead)
+        return dead
+
+    def resort(self) -> None:
+        """
+        sorts the board by y again.  Only entities that have moved out of order are
+        taken out and reinserted, rather than sorting everything
+        """
+        self.sorts += 1
+        old = self.ys
+        ys = [e.y for e in self]
+        kept: list[int] = []
+        moved: list[int] = []
+        for i, y in enumerate(ys):
+            while kept and ys[kept[-1]] > y:
+                # one of the two is out of place, take out whichever moved more
+                if abs(y - old[i]) >= abs(ys[kept[-1]] - old[kept[-1]]):
+                    moved.append(i)
+                    break
+                moved.append(kept.pop())
+            else:
+                kept.append(i)
+        if not moved:
+            self.ys = ys
+            return
+        new_order = [self[i] for i in kept]
+        new_ys = [ys[i] for i in kept]
+        for i in sorted(moved):
+            place = bisect.bisect_right(new_ys, ys[i])
+            new_ys.insert(place, ys[i])
+            new_order.insert(place, self[i])
+        self[:] = new_order
+        self.ys = new_ys
+
+    def range_indices(self, low: int, high: int) -> tuple[int, int]:
+        """
+        the slice of the board that holds every entity strictly between two y
+        values.  Found from the ys as of the last sort, reaching MAX_TICK_MOVEMENT
+        further, then widened for as long as the entities at its edges are in
+        range by where they are now.  The slice can hold entities that are out of
+        range, so callers still check each entity's y.
+        """
+        start = bisect.bisect_right(self.ys, low - MAX_TICK_MOVEMENT)
+        end = bisect.bisect_left(self.ys, high + MAX_TICK_MOVEMENT)
+        while start > 0 and low < self[start - 1].y < high:
+            start -= 1
+        while end < len(self) and low < self[end].y < high:
+            end += 1
+        return start, end
+
+    def in_range(self, low: int, high: int):
+        """
+        all entities strictly between two y values
+        """
+        start, end = self.range_indices(low, high)
+        return (self[i] for i in range(start, end) if low < self[i].y < high)
+
+
+class DrawBoard:
+    """
+    the entities to draw, in order of draw priority, and within a priority in the
+    order they were added.  Each priority has its own bucket, so adding an entity
+    never sorts anything.  Entities are taken off by marking them discarded, and
+    swept off all at once.
+    """
+
+    def __init__(self):
+        self.buckets: dict[float, list[entities.Entity]] = dict()
+        self.priorities: list[float] = []  # the priorities of the buckets, in order
+        self.discarded: int = 0  # how many entities are marked but not swept off yet
+
+    def append(self, entity: entities.Entity) -> None:
+        bucket = self.buckets.get(entity.draw_priority)
+        if bucket is None:
+            bucket = self.buckets[entity.draw_priority] = []
+            bisect.insort(self.priorities, entity.draw_priority)
+        bucket.append(entity)
+
+    def extend(self, new: list[entities.Entity]) -> None:
+        for entity in new:
+            self.append(entity)
+
+    def discard(self, entity: entities.Entity) -> None:
+        """
+        marks an entity to be taken off the next time the board is swept
+        """
+        entity.discarded = True
+        self.discarded += 1
+
+    def sweep(self) -> list[entities.Entity]:
+        """
+        takes every discarded entity off of the board in one pass
+        :return: the entities taken off
+        """
+        swept: list[entities.Entity] = []
+        if not self.discarded:
+            return swept
+        for priority in self.priorities:
+            bucket = self.buckets[priority]
+            kept = []
+            for e in bucket:
+                (swept if e.discarded else kept).append(e)
+            bucket[:] = kept
+            if not bucket:
+                del self.buckets[priority]
+        self.priorities = [priority for priority in self.priorities if priority in self.buckets]
+        self.discarded = 0
+        return swept
+
+    def clear(self) -> None:
+        self.buckets.clear()
+        self.priorities.clear()
+        self.discarded = 0
+
+    def __iter__(self):
+        for priority in self.priorities:
+            yield from self.buckets[priority]
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+
+ENTITY_BOARD: EntityBoard = EntityBoard()
+DRAW_ENTITY_BOARD: DrawBoard = DrawBoard()
 NEW_ENTITIES: list[entities.Entity] = []
 
-PARTICLE_BOARD: set[entities.Particle] = set()
+PARTICLE_BOARD: particles.ParticlePool = particles.ParticlePool()
+frame_timing.COUNTERS["entities"] = lambda: len(ENTITY_BOARD)
+frame_timing.COUNTERS["particles"] = lambda: len(PARTICLE_BOARD) + sum(
+    len(area.particle_list) for area in game_structures.AREA_QUEUE
+)
 
 
 def remove_from_hierarchy_boards(entity: entities.Entity):
-    DRAW_ENTITY_BOARD.remove(entity)
+    DRAW_ENTITY_BOARD.discard(entity)
 
 
-def particle_set_tick(particle_set: set[entities.Particle]):
-    remove_list = deque()
-    for particle in particle_set:
-        if not particle.tick():
-            remove_list.append(particle)
-    for particle in remove_list:
-        particle_set.remove(particle)
-        particle.reset_id_check()
+def sweep_draw_board() -> None:
+    """
+    sweeps discarded entities off of the draw board, and pools the ones that can
+    be reused
+    """
+    for entity in DRAW_ENTITY_BOARD.sweep():
+        if isinstance(entity, entities.Pooled):
+            entity.recycle()
 
 
-def filter_entities(lst: list[entities.Entity]) -> None:
+def filter_entities(lst: EntityBoard) -> None:
     """
-    filters an entity list in place
-    :param lst: a list of entities
+    filters an entity board in place
+    :param lst: a board of entities
     :return: None
     """
-    l: int = 0
-    for u in range(len(lst)):
-        if lst[u].alive:
-            lst[l] = lst[u]
-            lst[l].index = l
-            l += 1
-        else:
-            lst[u].die()
-            remove_from_hierarchy_boards(lst[u])
-    del lst[l:]
+    for entity in lst.discard_dead():
+        entity.die()
+        remove_from_hierarchy_boards(entity)
 
 
 def tick(do_tick: bool = True, draw_gui: bool = True):
@@ -205,7 +430,13 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
     :return:
     """
     global camera_move
+    frame_timing.begin()
     if do_tick:
+        if not game_structures.NEW_AREAS and game_structures.AREA_QUEUE[-1].end_coordinate < game_states.CAMERA_BOTTOM + 2 * game_states.HEIGHT:
+            # the next area starts after the last one ends, so it might be due
+            # now.  If it is, it has to load this tick even if it hasn't been
+            # made yet, or replays would depend on how fast areas are made
+            game_areas.wait_for_next_area()
         if game_structures.NEW_AREAS:
             if game_structures.NEW_AREAS[0].start_coordinate < game_states.CAMERA_BOTTOM + 2 * game_states.HEIGHT:
                 area = game_structures.NEW_AREAS.popleft()
@@ -240,6 +471,7 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
                 if abs(game_states.Y_DISPLACEMENT) > abs(game_states.Y_LIMIT):
                     game_states.Y_DISPLACEMENT += 2 * (abs(game_states.Y_DISPLACEMENT) - abs(game_states.Y_LIMIT)) * ((game_states.Y_DISPLACEMENT < 0) * 2 - 1)
                     game_states.Y_CHANGE *= -1
+    frame_timing.lap("area loading")
     pygame.draw.line(
         game_structures.SCREEN,
         (255, 255, 255),
@@ -257,11 +489,11 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
             [entity.final_load() for entity in NEW_ENTITIES]
             ENTITY_BOARD.extend(NEW_ENTITIES)
             DRAW_ENTITY_BOARD.extend(NEW_ENTITIES)
-            DRAW_ENTITY_BOARD.sort(key=lambda e: e.draw_priority)
             NEW_ENTITIES.clear()
-        ENTITY_BOARD.sort(key=lambda e: e.y)
+        ENTITY_BOARD.resort()
         filter_entities(ENTITY_BOARD)
-        entities.Entity.biggest_radius = max(ENTITY_BOARD, key=entities.Entity.radius).radius()
+        sweep_draw_board()
+        frame_timing.lap("sort/filter")
         game_structures.PLAYER_ENTITY.glide_tick()
         entities.CarriesItems.tick(game_structures.PLAYER_ENTITY)
         area: game_areas.GameArea
@@ -299,20 +531,28 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
                 # if isinstance(e, entities.AreaStarter):
                 #     continue
                 e.tick()
+    frame_timing.lap("entity tick")
     # particles need to go on bottom
     for area in game_structures.AREA_QUEUE:
         area.draw_particles()
     # handle global particle board
-    for particle in PARTICLE_BOARD:
-        particle.draw()
+    PARTICLE_BOARD.draw()
     if do_tick:
-        particle_set_tick(PARTICLE_BOARD)
-    # entities over particles
+        PARTICLE_BOARD.tick()
+    frame_timing.lap("particles")
+    # entities over particles, skipping any that are offscreen
+    margin = ENTITY_BOARD.biggest_radius() + abs(game_states.Y_DISPLACEMENT)
+    visible = set(ENTITY_BOARD.in_range(
+        game_states.CAMERA_BOTTOM - margin, game_states.CAMERA_BOTTOM + game_states.HEIGHT + margin
+    ))
+    visible.update([e.holding for e in visible if e.is_holder])
     for e in DRAW_ENTITY_BOARD:
-        e.draw()
+        if e in visible or not e.cull_offscreen:
+            e.draw()
     # whatever special effects an area needs
     for area in game_structures.AREA_QUEUE:
         area.draw()
+    frame_timing.lap("draw")
     if draw_gui:
         # draw distance record
         game_structures.SCREEN.blit(
@@ -327,6 +567,7 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
         abilities.draw_dash_icon(ingame.tick_counter)
         # draw hearts
         draw_hearts(do_tick)
+    frame_timing.lap("gui")
     # camera movement
     if do_tick:
         camera_move //= 2
@@ -377,3 +618,4 @@ def tick(do_tick: bool = True, draw_gui: bool = True):
             game_states.CAMERA_BOTTOM = game_states.DISTANCE - game_states.CAMERA_THRESHOLDS[0] - tutorials.display_height * switches.TUTORIAL_TEXT_POSITION
         if game_states.DISTANCE > game_states.CAMERA_BOTTOM + game_states.HEIGHT - game_states.CAMERA_THRESHOLDS[1]:
             game_states.CAMERA_BOTTOM = game_states.DISTANCE + game_states.CAMERA_THRESHOLDS[1] - game_states.HEIGHT
+    frame_timing.lap("camera")
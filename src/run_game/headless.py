@@ -0,0 +1,211 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+runs the game without a window, as fast as it can, from scripted input.  For
+soak testing seeds.
+"""
+import ast
+import time
+from typing import Callable
+
+import pygame
+
+from data import game_states
+from general_use import game_structures, utility
+from run_game import ingame
+
+
+class NullSurface(pygame.Surface):
+    """
+    a screen that throws away everything drawn onto it
+    """
+
+    def blit(self, source, dest, area=None, special_flags=0) -> pygame.Rect:
+        return pygame.Rect(0, 0, 0, 0)
+
+    def blits(self, blit_sequence, doreturn=True):
+        return [] if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0) -> pygame.Rect:
+        return pygame.Rect(0, 0, 0, 0)
+
+
+def null_draw(draw_func):
+    def inner(surface, *args, **kwargs):
+        if isinstance(surface, NullSurface):
+            return pygame.Rect(0, 0, 0, 0)
+        return draw_func(surface, *args, **kwargs)
+    return inner
+
+
+def install() -> None:
+    """
+    swaps out the screen, draw calls and display for ones that do nothing
+    """
+    game_structures.SCREEN = NullSurface((0, 0), pygame.SRCALPHA)
+    for name in ("line", "lines", "aaline", "aalines", "circle", "rect", "polygon", "ellipse", "arc"):
+        setattr(pygame.draw, name, null_draw(getattr(pygame.draw, name)))
+    game_structures.display_screen = utility.passing
+    game_structures.display_rects = utility.passing
+
+
+"""
+mouse buttons for each hand, for the script
+"""
+hand_buttons = {
+    "left": 1,
+    "right": 3
+}
+
+
+class ScriptedInput:
+    """
+    plays back a looping script of input.  Each step of the script is
+    (ticks, held, pressed), where held and pressed are names of Inputs, or of a
+    hand (left or right).  Held inputs are held for the entire step, pressed
+    inputs are pressed once at the start of the step.
+    """
+
+    def __init__(self, steps: list[tuple[int, tuple[str, ...], tuple[str, ...]]]):
+        if not steps:
+            raise ValueError("An input script needs at least one step")
+        self.steps = steps
+        self.step = 0
+        self.left = 0
+        self.held_keys: set[int] = set()
+        self.held_hands: set[int] = set()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held_keys
+
+    def __call__(self):
+        return self
+
+    def tick(self) -> None:
+        """
+        moves the script forward by one tick, posting any events for it
+        """
+        if self.left > 0:
+            self.left -= 1
+            return
+        for button in self.held_hands:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=(0, 0)))
+        ticks, held, pressed = self.steps[self.step]
+        self.step = (self.step + 1) % len(self.steps)
+        self.left = ticks - 1
+        self.held_keys = {getattr(ingame.Inputs, name) for name in held if name not in hand_buttons}
+        self.held_hands = {hand_buttons[name] for name in held if name in hand_buttons}
+        for button in self.held_hands:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(0, 0)))
+        for name in pressed:
+            if name in hand_buttons:
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=hand_buttons[name], pos=(0, 0)))
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=hand_buttons[name], pos=(0, 0)))
+            else:
+                key = getattr(ingame.Inputs, name)
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+"""
+walks up, dashing and swinging both hands, and skips through tutorial text
+"""
+DEFAULT_SCRIPT = [
+    (90, ("up_input",), ("next_text",)),
+    (1, ("up_input",), ("dash",)),
+    (20, ("up_input", "left"), ()),
+    (30, ("down_input", "right"), ("next_text",)),
+    (40, ("up_input",), ("left", "right")),
+]
+
+
+def load_script(path: str) -> list[tuple[int, tuple[str, ...], tuple[str, ...]]]:
+    """
+    reads an input script, one step per line.  Blank lines and lines starting
+    with # are ignored
+    """
+    with open(path, "r") as file:
+        return [
+            ast.literal_eval(line)
+            for line in file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def run(ticks: int, seed: int | None = None, script: str | None = None) -> None:
+    """
+    runs the game headlessly for a number of ticks, starting a new run on the
+    next seed whenever one ends, then reports how fast it went
+    """
+    from run_game import replay
+    replay.RECORD = False
+    inputs = ScriptedInput(DEFAULT_SCRIPT if script is None else load_script(script))
+    if seed is None:
+        seed = int(time.time()) % 256 ** 8
+    simulate(inputs, seed, lambda done: done < ticks, restart=True)
+
+
+def simulate(inputs, seed: int, keep_going: Callable[[int], bool], restart: bool) -> None:
+    """
+    runs the game headlessly from an input source, then reports how fast it went
+    :param inputs: where input comes from.  Ticked before each game tick, and
+    read from for held keys
+    :param seed: the seed of the first run
+    :param keep_going: given the number of ticks so far, if the simulation
+    should keep going
+    :param restart: if a new run should start, on the next seed, when one ends.
+    Otherwise, the simulation stops when the run ends
+    """
+    from screens import run_start_end
+    install()
+    run_start_end.LOG_RUNS = False
+    ingame.key_source = inputs
+
+    def headless_tick():
+        inputs.tick()
+        game_states.PLACE.tick()
+
+    utility.set_game_tick(headless_tick)
+    utility.set_fps(None)
+
+    runs = 1
+    done = 0
+    game_structures.switch_to_place(game_structures.PLACES.in_game, with_seed=seed)
+    start = time.perf_counter()
+    try:
+        while game_states.RUNNING and keep_going(done):
+            try:
+                utility.tick()
+            except Exception as E:
+                if not game_states.PLACE.crash(E):
+                    utility.log_error(E)
+                    game_states.RUNNING = False
+            done += 1
+            if game_states.PLACE is not ingame.screen:
+                if not restart:
+                    break
+                seed += 1
+                runs += 1
+                game_structures.switch_to_place(game_structures.PLACES.in_game, with_seed=seed)
+    finally:
+        elapsed = time.perf_counter() - start
+        print(
+            f"Ran {done} ticks over {runs} run(s) in {elapsed:.2f} s: "
+            f"{done / elapsed if elapsed > 0 else 0:.1f} ticks/second",
+            flush=True
+        )
+        # however the simulation stopped, the place it stopped in is left
+        game_states.PLACE.exit()
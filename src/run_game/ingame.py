@@ -35,6 +35,17 @@ class Inputs:
     next_text = pygame.K_RETURN
 
 
+"""
+where held keys are read from.  Swapped out for scripted input when headless
+"""
+key_source = pygame.key.get_pressed
+
+"""
+gets told the input of each tick, to record it.  See replay.Recorder
+"""
+input_recorder = None
+
+
 loop_counter = 2 ** 10
 
 tick_counter = 0
@@ -96,6 +107,8 @@ def pause():
 
 
 def tick(do_tick: bool = True):
+    if input_recorder is not None:
+        input_recorder.tick(key_source())
     game_tick(do_tick and game_states.TUTORIAL_FADE_COUNTER == 0)
     tutorials.tick(do_tick)
 
@@ -139,7 +152,7 @@ def game_tick(do_tick: bool = True):
         #         ))
         #     game_states.DISTANCE += game_states.GLIDE_SPEED * game_states.GLIDE_DIRECTION
         elif game_states.HEALTH > 0:
-            pressed = pygame.key.get_pressed()
+            pressed = key_source()
             direction = pressed[Inputs.up_input] - pressed[Inputs.down_input]
             if abs(direction) == 1:
                 game_states.LAST_DIRECTION = direction
@@ -159,7 +172,7 @@ def item_input_catch(num: int) -> None:
     if game_structures.HANDS[1 - num] is None:
         if pickup_to_hand(1 - num):
             return
-    if pygame.key.get_pressed()[Inputs.prefer_pickup]:
+    if key_source()[Inputs.prefer_pickup]:
         pickup_to_hand(num)
         return
     if items.prevent_other_use(game_structures.HANDS[1 - num]):
@@ -183,6 +196,8 @@ mouse_button_mapping = (None, 0, None, 1)
 
 def event_catcher(event: pygame.event.Event) -> bool:
     global paused
+    if input_recorder is not None:
+        input_recorder.event(event)
     if paused:
         if event.type == pygame.KEYDOWN and event.key == Inputs.pause:
             paused = False
@@ -909,9 +909,9 @@ def simple_stab_tick(item: Item):
             ),
             user.rotation
         ))
-        rad = user.radius() + get_range(item) + entities.Entity.biggest_radius + 5
+        rad = user.radius() + get_range(item) + 5
         damage = item.data_pack[4]
-        hit = tuple(user.all_in_range(
+        hit = tuple(user.all_within(
                 rad, lambda e: e is not user and e not in item.data_pack[-1] and rect.colliderect(e.rect)
         ))
         if hit and from_player(item):
@@ -964,8 +964,8 @@ def simple_shield_tick(item: Item):
     rot = (user.rotation // 180 * 2) - 1
     radius = user.height // 2 + rect.height
 
-    collide_list = tuple(user.all_in_range(
-        entities.Entity.biggest_radius + radius,
+    collide_list = tuple(user.all_within(
+        radius,
         lambda ent: (ent.y - user.y) * rot > 0 and ent.colliderect(rect)
     ))
 
@@ -1181,8 +1181,8 @@ def hammer_tick(item: Item):
                 user.rotation
             )
             rect = img.get_rect(center=new_center)
-            collided = tuple(user.all_in_range(
-                radius + entities.Entity.biggest_radius,
+            collided = tuple(user.all_within(
+                radius,
                 lambda en: user.allied_with_player is not en.allied_with_player and not en.is_item_entity and en.colliderect(rect)
             ))
             if collided:
@@ -1201,7 +1201,7 @@ def hammer_tick(item: Item):
                     duration = item.data_pack[4]
                     target.flashing = duration
                     knocked = entities.KnockbackHolder(target, (target.y > user.y) * 2 - 1, speed, duration, damage)
-                    gameboard.ENTITY_BOARD[target.index] = knocked
+                    gameboard.ENTITY_BOARD.replace(target.index, knocked)
                 item.data_pack[0] = False
                 item.data_pack[1] = 0
     else:
@@ -0,0 +1,266 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+particle storage.  Particles are kept as columns of numbers in a pool rather
+than as objects, so that a whole pool can be ticked and drawn at once.
+"""
+import math
+
+import numpy
+import pygame
+
+from data import game_states, images
+from general_use import game_structures
+
+
+def rotate_frames(imgs: list[images.Image] | list[pygame.Surface], rotation: int) -> list[pygame.Surface]:
+    """
+    the frames of a particle, rotated
+    """
+    imgs = [img.img if isinstance(img, images.Image) else img for img in imgs]
+    if rotation == 0:
+        return imgs
+    return [pygame.transform.rotate(img, rotation) for img in imgs]
+
+
+class ParticleKind:
+    """
+    the frames and timing shared by every particle of one type and rotation
+    """
+
+    def __init__(self, imgs: list[images.Image] | list[pygame.Surface], tick_rate: int, radius: int = None, rotation: int = 0):
+        self.frames: list[pygame.Surface] = rotate_frames(imgs, rotation)
+        self.tick_rate: int = tick_rate
+        if radius is None:
+            radius = max(math.isqrt(img.get_width() ** 2 + img.get_height() ** 2) // 2 for img in self.frames)
+        self.radius: int = radius
+        self.index: int | None = None  # where the kind is registered, if it is
+
+
+"""
+every kind of particle in use.  Frames of all kinds are flattened into one list,
+and each kind has the offset of its first frame, so a pool only needs to track
+a kind index and a frame counter.  The arrays have room for more kinds and
+frames than are registered, doubling when they run out, so only their first
+len(KINDS) or len(FRAMES) entries mean anything.
+"""
+KINDS: list[ParticleKind] = []
+FRAMES: list[pygame.Surface] = []
+FRAME_OFFSETS = numpy.zeros(16, dtype=numpy.int64)
+TICK_RATES = numpy.ones(16, dtype=numpy.int64)
+FRAME_LOOPS = numpy.ones(16, dtype=numpy.int64)
+HALF_WIDTHS = numpy.zeros(64, dtype=numpy.int64)
+HALF_HEIGHTS = numpy.zeros(64, dtype=numpy.int64)
+RADII = numpy.zeros(16, dtype=numpy.int64)
+
+
+def __grown(array: numpy.ndarray, needed: int) -> numpy.ndarray:
+    """
+    the array, doubled until it has room for a number of entries
+    """
+    if needed <= len(array):
+        return array
+    capacity = len(array)
+    while capacity < needed:
+        capacity *= 2
+    new = numpy.ones(capacity, dtype=array.dtype)
+    new[:len(array)] = array
+    return new
+
+
+def register(kind: ParticleKind) -> int:
+    """
+    makes sure a particle kind is registered
+    :return: the index of the kind
+    """
+    global FRAME_OFFSETS, TICK_RATES, FRAME_LOOPS, HALF_WIDTHS, HALF_HEIGHTS, RADII
+    if kind.index is not None:
+        return kind.index
+    i = kind.index = len(KINDS)
+    KINDS.append(kind)
+    FRAME_OFFSETS = __grown(FRAME_OFFSETS, len(KINDS))
+    TICK_RATES = __grown(TICK_RATES, len(KINDS))
+    FRAME_LOOPS = __grown(FRAME_LOOPS, len(KINDS))
+    RADII = __grown(RADII, len(KINDS))
+    FRAME_OFFSETS[i] = len(FRAMES)
+    TICK_RATES[i] = kind.tick_rate
+    FRAME_LOOPS[i] = len(kind.frames) * kind.tick_rate
+    RADII[i] = kind.radius
+    start = len(FRAMES)
+    FRAMES.extend(kind.frames)
+    HALF_WIDTHS = __grown(HALF_WIDTHS, len(FRAMES))
+    HALF_HEIGHTS = __grown(HALF_HEIGHTS, len(FRAMES))
+    HALF_WIDTHS[start:len(FRAMES)] = [img.get_width() // 2 for img in kind.frames]
+    HALF_HEIGHTS[start:len(FRAMES)] = [img.get_height() // 2 for img in kind.frames]
+    return i
+
+
+def clear_kinds() -> None:
+    """
+    forgets every registered kind.  Only call when every pool is empty.  The
+    arrays keep their room for the next run.
+    """
+    for kind in KINDS:
+        kind.index = None
+    KINDS.clear()
+    FRAMES.clear()
+
+
+"""
+a particle in a pool: its slot, and the generation of the slot when it was
+added.  A slot's generation goes up whenever its particle is removed, so a
+handle never refers to a later particle in the same slot.
+"""
+Handle = tuple[int, int]
+
+
+class ParticlePool:
+    """
+    a group of particles, stored as arrays.  The arrays are kept dense, so the
+    whole pool can be ticked and drawn at once, and each particle also has a
+    slot that stays the same while it moves around in the arrays, for handles.
+    """
+
+    columns = ("x", "y", "x_momentum", "y_momentum", "lifespan", "frame", "kind", "slot")
+
+    def __init__(self, capacity: int = 64):
+        self.count: int = 0
+        self.x = numpy.zeros(capacity, dtype=numpy.float64)
+        self.y = numpy.zeros(capacity, dtype=numpy.float64)
+        self.x_momentum = numpy.zeros(capacity, dtype=numpy.float64)
+        self.y_momentum = numpy.zeros(capacity, dtype=numpy.float64)
+        self.lifespan = numpy.zeros(capacity, dtype=numpy.int64)
+        self.frame = numpy.zeros(capacity, dtype=numpy.int64)
+        self.kind = numpy.zeros(capacity, dtype=numpy.int64)
+        self.slot = numpy.zeros(capacity, dtype=numpy.int64)  # the slot of the particle at each index
+        self.generations = numpy.zeros(capacity, dtype=numpy.int64)
+        self.indices = numpy.full(capacity, -1, dtype=numpy.int64)  # the index of the particle in each slot, or -1
+        self.free: list[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, handle: Handle) -> bool:
+        slot, generation = handle
+        return 0 <= slot < len(self.generations) and self.generations[slot] == generation and self.indices[slot] >= 0
+
+    def __grow(self):
+        old_capacity = len(self.x)
+        for column in self.columns:
+            old = getattr(self, column)
+            new = numpy.zeros(2 * old_capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, column, new)
+        self.generations = numpy.concatenate((self.generations, numpy.zeros(old_capacity, dtype=numpy.int64)))
+        self.indices = numpy.concatenate((self.indices, numpy.full(old_capacity, -1, dtype=numpy.int64)))
+        self.free.extend(range(2 * old_capacity - 1, old_capacity - 1, -1))
+
+    def add(self, particle) -> Handle:
+        """
+        adds a particle to the pool
+        :param particle: a Particle, or anything else with a kind, position,
+        momentum and lifespan
+        :return: a handle to the particle, for removing it early
+        """
+        if self.count == len(self.x):
+            self.__grow()
+        i = self.count
+        slot = self.free.pop()
+        self.x[i] = particle.x
+        self.y[i] = particle.y
+        self.x_momentum[i], self.y_momentum[i] = particle.momentum
+        self.lifespan[i] = particle.lifespan
+        self.frame[i] = 0
+        self.kind[i] = register(particle.kind)
+        self.slot[i] = slot
+        self.indices[slot] = i
+        self.count += 1
+        return slot, int(self.generations[slot])
+
+    def remove(self, handle: Handle) -> bool:
+        """
+        removes a particle before it runs out, by moving the last particle into
+        its place
+        :return: if the particle was still in the pool
+        """
+        if handle not in self:
+            return False
+        slot = handle[0]
+        i = self.indices[slot]
+        last = self.count - 1
+        for column in self.columns:
+            array = getattr(self, column)
+            array[i] = array[last]
+        self.indices[self.slot[i]] = i
+        self.__free(slot)
+        self.count = last
+        return True
+
+    def __free(self, slots) -> None:
+        self.generations[slots] += 1
+        self.indices[slots] = -1
+        if isinstance(slots, numpy.ndarray):
+            self.free.extend(slots.tolist())
+        else:
+            self.free.append(slots)
+
+    def clear(self) -> None:
+        self.__free(self.slot[:self.count].copy())
+        self.count = 0
+
+    def tick(self) -> None:
+        """
+        moves every particle forward a tick, and removes the ones that have run out
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.lifespan[:n] -= 1
+        self.frame[:n] += 1
+        self.frame[:n] %= FRAME_LOOPS[self.kind[:n]]
+        self.x[:n] += self.x_momentum[:n]
+        self.y[:n] += self.y_momentum[:n]
+        alive = self.lifespan[:n] > 0
+        if alive.all():
+            return
+        self.__free(self.slot[:n][~alive])
+        self.count = int(numpy.count_nonzero(alive))
+        for column in self.columns:
+            array = getattr(self, column)
+            array[:self.count] = array[:n][alive]
+        self.indices[self.slot[:self.count]] = numpy.arange(self.count)
+
+    def draw(self) -> None:
+        """
+        draws every onscreen particle in the pool in a single blits call
+        """
+        n = self.count
+        if n == 0:
+            return
+        kinds = self.kind[:n]
+        view_center = game_states.CAMERA_BOTTOM - game_states.Y_DISPLACEMENT + game_states.HEIGHT // 2
+        onscreen = numpy.abs(self.y[:n] - view_center) < game_states.HEIGHT // 2 + RADII[kinds]
+        if not onscreen.any():
+            return
+        kinds = kinds[onscreen]
+        frames = FRAME_OFFSETS[kinds] + self.frame[:n][onscreen] // TICK_RATES[kinds]
+        xs = self.x[:n][onscreen] + (game_states.WIDTH // 2 + game_states.X_DISPLACEMENT) - HALF_WIDTHS[frames]
+        ys = (game_states.HEIGHT + game_states.CAMERA_BOTTOM - game_states.Y_DISPLACEMENT) - self.y[:n][onscreen] - HALF_HEIGHTS[frames]
+        game_structures.SCREEN.blits(
+            list(zip(map(FRAMES.__getitem__, frames.tolist()), zip(xs.tolist(), ys.tolist()))),
+            doreturn=False
+        )
@@ -0,0 +1,303 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+records the input of a run, and plays it back.  Runs are deterministic from
+their seed, so the seed and input are enough to repeat a run exactly.
+
+A replay file is a header (REPLAY_MAGIC, a version byte, the seed as 8
+little-endian bytes, then the screen width and height as 2 each, since areas
+are sized by the screen) followed by one entry per stretch of identical ticks:
+a byte of held inputs, the number of events as a varint, the events in the
+order they happened as a byte each, and the number of ticks as a varint.
+"""
+import datetime
+import os
+
+import pygame
+
+from data import game_states
+from run_game import ingame
+
+
+REPLAY_MAGIC = b"DTLR"
+REPLAY_VERSION = 2
+REPLAY_FOLDER = "./replays"
+REPLAY_EXTENSION = ".dtlr"
+HEADER_LENGTH = len(REPLAY_MAGIC) + 1 + 8 + 2 + 2
+
+"""
+whether runs are recorded.  Off for headless runs and playback.
+"""
+RECORD = True
+
+"""
+how many replays are kept.  The oldest are deleted past this.
+"""
+REPLAY_LIMIT = 50
+
+"""
+held inputs, by bit.  Pausing is recorded as a state rather than an event, since
+the pause menu can be left through its buttons as well as a key.
+"""
+HELD_INPUTS = ("up_input", "down_input", "prefer_pickup")
+PAUSED_BIT = 1 << len(HELD_INPUTS)
+
+"""
+the events that are recorded, by the byte they are recorded as
+"""
+EVENTS = (
+    (pygame.KEYDOWN, "dash"),
+    (pygame.KEYDOWN, "next_text"),
+    (pygame.MOUSEBUTTONDOWN, 1),
+    (pygame.MOUSEBUTTONDOWN, 3),
+    (pygame.MOUSEBUTTONUP, 1),
+    (pygame.MOUSEBUTTONUP, 3),
+)
+
+
+def event_index(event: pygame.event.Event) -> int | None:
+    """
+    the byte an event is recorded as, or None if it isn't recorded
+    """
+    for i, (typ, detail) in enumerate(EVENTS):
+        if event.type != typ:
+            continue
+        if typ == pygame.KEYDOWN:
+            if event.key == getattr(ingame.Inputs, detail):
+                return i
+        elif event.button == detail:
+            return i
+    return None
+
+
+def make_event(i: int) -> pygame.event.Event:
+    typ, detail = EVENTS[i]
+    if typ == pygame.KEYDOWN:
+        return pygame.event.Event(typ, key=getattr(ingame.Inputs, detail), mod=0, unicode="", scancode=0)
+    return pygame.event.Event(typ, button=detail, pos=(0, 0))
+
+
+def write_varint(out: bytearray, num: int) -> None:
+    while num >= 0x80:
+        out.append(num & 0x7F | 0x80)
+        num >>= 7
+    out.append(num)
+
+
+def read_varint(data: bytes, i: int) -> tuple[int, int]:
+    """
+    :return: the number, and the index after it
+    """
+    num = 0
+    shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        num |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return num, i
+        shift += 7
+
+
+class Recorder:
+    """
+    records the input of a run, tick by tick
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.data = bytearray(REPLAY_MAGIC)
+        self.data.append(REPLAY_VERSION)
+        self.data += seed.to_bytes(8, "little")
+        self.data += game_states.WIDTH.to_bytes(2, "little")
+        self.data += game_states.HEIGHT.to_bytes(2, "little")
+        self.held = 0
+        self.events: list[int] = []
+        self.ticks = 0  # ticks the current held and events have lasted, without the current tick
+
+    def __flush(self):
+        if self.ticks == 0:
+            return
+        self.data.append(self.held)
+        write_varint(self.data, len(self.events))
+        self.data += bytes(self.events)
+        write_varint(self.data, self.ticks)
+
+    def tick(self, pressed) -> None:
+        """
+        starts a new tick
+        :param pressed: the held keys for the tick
+        """
+        held = sum(1 << i for i, name in enumerate(HELD_INPUTS) if pressed[getattr(ingame.Inputs, name)])
+        if ingame.paused:
+            held |= PAUSED_BIT
+        if self.events or held != self.held:
+            self.__flush()
+            self.held = held
+            self.events = []
+            self.ticks = 0
+        self.ticks += 1
+
+    def event(self, event: pygame.event.Event) -> None:
+        """
+        records an event for the current tick
+        """
+        if ingame.paused or self.ticks == 0:
+            return
+        index = event_index(event)
+        if index is None:
+            return
+        if self.ticks > 1:
+            # split the current tick off of the ones before it
+            self.ticks -= 1
+            self.__flush()
+            self.ticks = 1
+        self.events.append(index)
+
+    def save(self) -> str:
+        """
+        writes the replay to the replay folder
+        :return: the path to the replay
+        """
+        self.__flush()
+        self.ticks = 0
+        os.makedirs(REPLAY_FOLDER, exist_ok=True)
+        path = os.path.join(
+            REPLAY_FOLDER,
+            f"{datetime.datetime.now().strftime('%y%m%d-%H%M%S')}-{self.seed}{REPLAY_EXTENSION}"
+        )
+        with open(path, "wb") as file:
+            file.write(self.data)
+        prune()
+        return path
+
+
+def saved_replays() -> list[str]:
+    """
+    the paths of the saved replays, oldest first
+    """
+    if not os.path.isdir(REPLAY_FOLDER):
+        return []
+    return [
+        os.path.join(REPLAY_FOLDER, name)
+        for name in sorted(os.listdir(REPLAY_FOLDER))
+        if name.endswith(REPLAY_EXTENSION)
+    ]
+
+
+def prune(keep: int | None = None) -> None:
+    """
+    deletes the oldest replays, so that only so many are kept
+    :param keep: how many to keep.  Defaults to REPLAY_LIMIT
+    """
+    if keep is None:
+        keep = REPLAY_LIMIT
+    replays = saved_replays()
+    for path in replays[:max(len(replays) - keep, 0)]:
+        os.remove(path)
+
+
+def clear() -> None:
+    """
+    deletes every saved replay
+    """
+    prune(0)
+
+
+def start_recording() -> None:
+    ingame.input_recorder = Recorder(game_states.SEED) if RECORD else None
+
+
+def stop_recording() -> str | None:
+    """
+    stops recording the run, and saves what was recorded
+    :return: the path to the replay, if there is one
+    """
+    recorder = ingame.input_recorder
+    if recorder is None:
+        return None
+    ingame.input_recorder = None
+    return recorder.save()
+
+
+def read_header(path: str) -> tuple[int, tuple[int, int], bytes]:
+    """
+    reads a replay file
+    :return: the seed, the screen dimensions, and the recorded ticks
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+        raise ValueError(f"{path} is not a replay")
+    i = len(REPLAY_MAGIC)
+    if data[i] != REPLAY_VERSION:
+        raise ValueError(f"{path} is replay version {data[i]}, only version {REPLAY_VERSION} can be played")
+    seed = int.from_bytes(data[i + 1:i + 9], "little")
+    dimensions = int.from_bytes(data[i + 9:i + 11], "little"), int.from_bytes(data[i + 11:i + 13], "little")
+    return seed, dimensions, data[HEADER_LENGTH:]
+
+
+class Replay:
+    """
+    plays back a recorded run as input
+    """
+
+    def __init__(self, path: str):
+        self.seed, self.dimensions, self.data = read_header(path)
+        self.index = 0
+        self.left = 0
+        self.held_keys: set[int] = set()
+        self.finished = False
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held_keys
+
+    def __call__(self):
+        return self
+
+    def tick(self) -> None:
+        """
+        moves the replay forward by one tick, posting any events for it
+        """
+        if self.left > 0:
+            self.left -= 1
+            return
+        if self.index >= len(self.data):
+            self.finished = True
+            return
+        held = self.data[self.index]
+        count, events_start = read_varint(self.data, self.index + 1)
+        events = self.data[events_start:events_start + count]
+        ticks, self.index = read_varint(self.data, events_start + count)
+        self.left = ticks - 1
+        self.held_keys = {getattr(ingame.Inputs, name) for i, name in enumerate(HELD_INPUTS) if held & 1 << i}
+        ingame.paused = bool(held & PAUSED_BIT)
+        for i in events:
+            pygame.event.post(make_event(i))
+
+
+def play(path: str) -> None:
+    """
+    plays back a replay without a window, as fast as possible
+    """
+    from run_game import headless
+    global RECORD
+    RECORD = False
+    replay = Replay(path)
+    if replay.dimensions != (game_states.WIDTH, game_states.HEIGHT):
+        raise ValueError(f"{path} was recorded at {replay.dimensions}, but the screen is {(game_states.WIDTH, game_states.HEIGHT)}")
+    headless.simulate(replay, replay.seed, lambda _: not replay.finished, restart=False)
@@ -19,7 +19,7 @@ handles the tutorial
 """
 
 from data import game_states, switches
-from general_use import game_structures
+from general_use import game_structures, buttons
 from collections import deque
 from dataclasses import dataclass
 import pygame
@@ -64,6 +64,64 @@ WAIT_TIMES: dict[str, int | float] = {".": 12, ",": 8}
 switch_ratio: float = 2/3
 
 
+class TypingLayout:
+    """
+    tutorial text wrapped and rendered once, when it starts being typed.  As it
+    is typed, only the newly typed part of each line is copied onto the display
+    """
+
+    def __init__(self, text: str, font: pygame.font.Font):
+        self.text = text
+        self.font = font
+        self.lines: list[str] = [line for line, _length in buttons.FontMetrics.of(font).wrap(
+            text, max_line_pixels=game_states.WIDTH
+        )]
+        self.starts: list[int] = []  # where each line starts in the text
+        at = 0
+        for line in self.lines:
+            at = text.find(line, at)
+            self.starts.append(at)
+            at += len(line)
+        self.rendered = [font.render(line, True, (255, 255, 255), None) for line in self.lines]
+        self.linesize = font.get_linesize()
+        self.surface = pygame.Surface((game_states.WIDTH, self.linesize * len(self.lines)), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 255))
+        self.shown = [0] * len(self.lines)  # how many characters of each line are on the surface
+        self.shown_widths = [0] * len(self.lines)
+        self.shown_lines = 0
+        self.display: pygame.Surface | None = None
+
+    def reveal(self, count: int) -> pygame.Surface:
+        """
+        shows the text up to a number of characters
+        :return: the display, with only the lines that have started showing
+        """
+        for i in range(len(self.lines)):
+            start = self.starts[i]
+            if start >= count:
+                break
+            show = min(len(self.lines[i]), count - start)
+            if show <= self.shown[i]:
+                continue
+            width = self.rendered[i].get_width() if show == len(self.lines[i]) else \
+                self.font.size(self.lines[i][:show])[0]
+            # glyphs can lean back over the ones before them, so redraw a little of those too
+            old_width = max(0, self.shown_widths[i] - self.linesize // 4)
+            area = pygame.Rect(old_width, 0, width - old_width, self.linesize)
+            self.surface.fill((0, 0, 0, 255), area.move(0, i * self.linesize))
+            self.surface.blit(self.rendered[i], (old_width, i * self.linesize), area)
+            self.shown[i] = show
+            self.shown_widths[i] = width
+        lines = max(1, sum(1 for start in self.starts if start < count))
+        if lines != self.shown_lines:
+            self.shown_lines = lines
+            self.display = self.surface.subsurface((0, 0, game_states.WIDTH, lines * self.linesize))
+        return self.display
+
+
+layout: TypingLayout | None = None
+
+
 def make_overlay():
     global tutorial_overlay
     tutorial_overlay = pygame.Surface(game_structures.SCREEN.get_size(), pygame.SRCALPHA)
@@ -84,9 +142,10 @@ def next_pressed():
 
 
 def next_text():
-    global on, current_text, typing, display
+    global on, current_text, typing, display, layout
     if len(TUTORIAL_TEXTS) > 0:
         on = TUTORIAL_TEXTS.popleft()
+        layout = None
         game_structures.speak(on.text)
         current_text = on.text[0]
         typing = True
@@ -102,21 +161,17 @@ def stop_typing():
 
 
 def update_display():
-    global display, display_height
-    display = game_structures.BUTTONS.draw_text(
-        current_text,
-        on.font,
-        (0, 0, 0, 255),
-        (255, 255, 255),
-        max_line_pixels=game_states.WIDTH,
-        enforce_width=game_states.WIDTH
-    )
+    global display, display_height, layout
+    if layout is None or layout.font is not on.font or not layout.text.startswith(current_text):
+        layout = TypingLayout(on.text if on.text.startswith(current_text) else current_text, on.font)
+    display = layout.reveal(len(current_text))
     display_height = display.get_height()
 
 
 def clear_display():
-    global display, display_height, current_text
+    global display, display_height, current_text, layout
     display = None
+    layout = None
     display_height = 0
     current_text = ""
 
@@ -126,9 +181,10 @@ def clear_tutorial_text():
     clears the tutorial texts to let users print atop them
     :return:
     """
-    global display, on, typing
+    global display, on, typing, layout
     TUTORIAL_TEXTS.clear()
     display = None
+    layout = None
     typing = False
     on = None
 
@@ -1347,5 +1347,6 @@ custom_runs_screen = game_structures.Place(
 	enter=setup_custom_run_screen,
 	end=save_custom_runs,
 	exit_on=save_custom_runs,
-	crash_on=save_custom_runs
+	crash_on=save_custom_runs,
+	static=True
 )
@@ -21,20 +21,39 @@ describe the run log screen of the game
 import ast
 
 from data import game_states
-from general_use import game_structures, utility
+from general_use import game_structures, utility, run_log, run_analytics
 from screens import main_screen, custom_runs
-from run_game import ingame
+from run_game import ingame, replay
 import pygame
 
 
-log_file_name: str = "./run_log.txt"
+"""
+the run log.  Records are only read from it when they scroll into view.
+"""
+RUN_LOG = run_log.RunLog()
+
+
+@utility.add_error_checking
+def make_record(i: int):
+    line: dict = RUN_LOG[i]
+    return RunRecord(
+        line.get("reason", "N/A"),
+        line.get("furthest", "N/A"),
+        line.get("progress", "N/A"),
+        line.get("date", "N/A"),
+        line.get("duration", "N/A"),
+        line.get("start_time", "N/A"),
+        line.get("end_time", "N/A"),
+        line.get("seed", "N/A"),
+        line.get("room_record", "N/A"),
+        line.get("custom_run", None)
+    )
 
 
-RECORDS = game_structures.ScrollableButtonHolder(
+RECORDS = game_structures.VirtualListHolder(
     pygame.rect.Rect(game_states.WIDTH // 4, 0, game_states.WIDTH // 2, game_states.HEIGHT),
-    pygame.surface.Surface((game_states.WIDTH // 2, game_states.HEIGHT)),
-    scrollable_x=False,
-    scrollable_y=True,
+    1,
+    make_record,
     outline_width=2,
     outline_color=(255, 255, 255)
 )
@@ -42,12 +61,10 @@ BUTTONS = game_structures.ButtonHolder()
 
 
 def clear_log():
-    RECORDS.x = 0
-    RECORDS.y = 0
-    RECORDS.background = pygame.surface.Surface((game_states.WIDTH // 2, game_states.HEIGHT))
-    RECORDS.rect = RECORDS.background.get_rect()
-    with open(log_file_name, "w") as log_file:
-        log_file.write("")
+    RECORDS.clear()
+    RUN_LOG.clear()
+    run_analytics.clear()
+    replay.clear()
     screen.start()
 
 
@@ -159,22 +176,6 @@ class RunRecord(game_structures.Place, game_structures.Button):
         game_structures.BUTTONS.remove(self.buttons)
 
 
-@utility.add_error_checking
-def make_record(line: dict):
-    RECORDS.add_button(RunRecord(
-        line.get("reason", "N/A"),
-        line.get("furthest", "N/A"),
-        line.get("progress", "N/A"),
-        line.get("date", "N/A"),
-        line.get("duration", "N/A"),
-        line.get("start_time", "N/A"),
-        line.get("end_time", "N/A"),
-        line.get("seed", "N/A"),
-        line.get("room_record", "N/A"),
-        line.get("custom_run", None)
-    ))
-
-
 @utility.make_async(singular=True)
 @utility.add_error_checking
 def enter(re_setup: bool = True):
@@ -187,9 +188,6 @@ def enter(re_setup: bool = True):
     BUTTONS.clear()
 
     if re_setup:
-        RECORDS.change_background_size(
-            (game_states.WIDTH // 2, game_states.HEIGHT)
-        )
         RECORDS.change_window((game_states.WIDTH // 4, 0), (game_states.WIDTH // 2, game_states.HEIGHT))
 
     BUTTONS.add_button(RECORDS)
@@ -201,32 +199,19 @@ def enter(re_setup: bool = True):
         game_structures.Button.make_text_button("Clear Log", 75, (0, 0), clear_log, background_color=(0, 0, 0),
                                                 outline_color=(255, 255, 255), x_align=0, y_align=0))
 
-    if not re_setup:
-        return
-    RECORDS.clear()
-    with open(log_file_name, "r") as log_file:
-        line = log_file.readline()
-        i = 0
-        while line:
-            i += 1
-            make_record(ast.literal_eval(line))
-            line = log_file.readline()
-    if len(RECORDS) > 0:
-        record_height: int = RECORDS[0].rect.height * 1.25
-        i: int = 0
-        for record in RECORDS.list:
-            record.rect.y = i * record_height
-            record.rect.x = 0
-            i += 1
-        RECORDS.change_background_size((game_states.WIDTH // 2, i * record_height))
-        RECORDS.y = RECORDS.background.get_rect().height - game_states.HEIGHT
-    else:
-        RECORDS.add_button(game_structures.Button.make_text_button("No runs logged.", 80,
-                                                                   (game_states.WIDTH // 4, game_states.HEIGHT // 2),
+    if re_setup:
+        RUN_LOG.check()
+        RUN_LOG.migrate()
+        RECORDS.row_height = round(game_structures.FONTS[100].get_linesize() * 1.25)
+        RECORDS.set_rows(len(RUN_LOG))
+        RECORDS.y = RECORDS.base_rect.height - RECORDS.rect.height
+
+    if len(RECORDS) == 0:
+        BUTTONS.add_button(game_structures.Button.make_text_button("No runs logged.", 80,
+                                                                   (game_states.WIDTH // 2, game_states.HEIGHT // 2),
                                                                    None, background_color=(0, 0, 0),
                                                                    outline_color=(255, 255, 255), border_width=0,
                                                                    text_align=0.5))
-    RECORDS.convert()
 
 
 def end():
@@ -236,5 +221,6 @@ def end():
 screen = game_structures.Place(
     tick=utility.passing,
     enter=enter,
-    end=end
+    end=end,
+    static=True
 )
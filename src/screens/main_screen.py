@@ -71,6 +71,12 @@ def setup_main_screen():
                 y_align=0
             )
         )
+        game_structures.BUTTONS.add_button(
+            game_structures.Button.make_text_button(
+                "Stats", 75, (game_states.WIDTH, 0), stats_screen.screen.start, x_align=1,
+                y_align=0
+            )
+        )
 
     def swap_custom_seed():
         game_states.CUSTOM_SEED = not game_states.CUSTOM_SEED
@@ -126,4 +132,4 @@ main_screen_place = game_structures.Place(
     end=end
 )
 
-from screens import run_start_end, log_screen, custom_runs
+from screens import run_start_end, log_screen, custom_runs, stats_screen
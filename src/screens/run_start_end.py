@@ -25,9 +25,9 @@ import math
 from collections import deque
 import pygame
 
-from general_use import game_structures
+from general_use import game_structures, run_log, run_analytics, frame_timing
 from data import game_states
-from run_game import game_areas, gameboard, ingame, tutorials, abilities, entities
+from run_game import game_areas, gameboard, ingame, tutorials, abilities, entities, particles, replay
 from screens import custom_runs
 import random
 import sys
@@ -146,11 +146,12 @@ def clean_gameboard():
     gameboard.ENTITY_BOARD.clear()
     gameboard.NEW_ENTITIES.clear()
     gameboard.PARTICLE_BOARD.clear()
+    particles.clear_kinds()
     game_structures.AREA_QUEUE.clear()
     game_structures.NEW_AREAS.clear()
 
     from run_game import entities
-    entities.Particle.__id = 0
+    entities.Pooled.clear_pools()
 
     on: Type[entities.Entity]
     for on in game_structures.recursive_subclasses(entities.Entity):
@@ -177,6 +178,7 @@ def reset_gameboard():
 
 
 def setup(with_seed: int = None, full: bool = True):
+    game_areas.AREA_GENERATOR.reset()
     if full:
         PAUSE_BUTTONS.clear()
         PAUSE_BUTTONS.add_button(game_structures.Button.make_text_button(
@@ -328,11 +330,12 @@ def setup(with_seed: int = None, full: bool = True):
 
 
 def populate_area_queue():
-    for i in range(game_states.AREA_QUEUE_MAX_LENGTH - len(game_structures.AREA_QUEUE) - len(game_structures.NEW_AREAS)):
+    for i in range(game_areas.wanted_areas() - len(game_structures.AREA_QUEUE) - len(game_structures.NEW_AREAS)):
         game_areas.add_game_area()
 
 
 def start(with_seed: int = None, full: bool = True, custom=None):
+    frame_timing.clear()
     if custom is not None:
         from screens import custom_runs
 
@@ -342,12 +345,14 @@ def start(with_seed: int = None, full: bool = True, custom=None):
         custom_runs.start_custom(custom)
 
         populate_area_queue()
+        ingame.input_recorder = None
     else:
         game_states.CUSTOM_RUN = None
         setup(with_seed, full)
         if full:
             game_areas.add_game_area().join()
             populate_area_queue()
+            replay.start_recording()
 
 
 class GameAreaLog:
@@ -373,14 +378,25 @@ class RunEndReasons(enum.Enum):
     quit = "quit"
 
 
+"""
+whether runs are logged.  Off for headless runs and playback, so they don't end
+up in the player's log and statistics.
+"""
+LOG_RUNS = True
+
+
 def log_run(reason: RunEndReasons):
     """
     logs the results of a run, including why it ended
     :return:
     """
+    if not LOG_RUNS:
+        replay.stop_recording()
+        return
     now = datetime.datetime.now()
     duration: datetime.timedelta = now - game_states.RUN_START
-    log_string = str({
+    log = run_log.open_log()
+    run = {
         "reason": reason.value,
         "date": now.date().strftime("%y/%m/%d"),
         "start_time": game_states.RUN_START.strftime("%H:%M:%S"),
@@ -390,7 +406,8 @@ def log_run(reason: RunEndReasons):
         "furthest": visual_distance(),
         "progress": game_states.AREAS_PASSED,
         "room_record": GameAreaLog.get_result_string(),
-        "custom_run": None if game_states.CUSTOM_RUN is None else custom_runs.custom_run_to_string(game_states.CUSTOM_RUN)
-    })
-    with open("./run_log.txt", "a") as file:
-        file.write(log_string + "\n")
+        "custom_run": None if game_states.CUSTOM_RUN is None else custom_runs.custom_run_to_string(game_states.CUSTOM_RUN),
+        "replay": replay.stop_recording()
+    }
+    log.append(run)
+    run_analytics.add_run(log, run)
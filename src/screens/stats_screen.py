@@ -0,0 +1,98 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+describe the run statistics screen of the game.  Admin only.
+"""
+
+import heapq
+
+from data import game_states
+from general_use import game_structures, run_analytics, utility
+from screens import main_screen
+
+
+BUTTONS = game_structures.ButtonHolder()
+
+"""
+how many seeds are shown, best first
+"""
+TOP_SEEDS = 10
+
+
+def describe(stats: run_analytics.RunStats) -> str:
+    lines = [
+        f"runs: {stats.runs}",
+        "",
+        "average distance: " + ", ".join((
+            f"{stats.mean('furthest'):.0f} overall",
+            f"{stats.rolling_average('furthest'):.0f} over the last {run_analytics.ROLLING_LENGTH}"
+        )),
+        "average progress: " + ", ".join((
+            f"{stats.mean('progress'):.1f} overall",
+            f"{stats.rolling_average('progress'):.1f} over the last {run_analytics.ROLLING_LENGTH}"
+        )),
+        "",
+        "endings:"
+    ]
+    lines.extend(f"  {reason}: {count}" for reason, count in stats.death_reasons().items())
+    lines.append("")
+    lines.append("best seeds:")
+    lines.extend(
+        f"  {seed}: {distance}"
+        for seed, distance in heapq.nlargest(TOP_SEEDS, stats.best_by_seed.items(), key=lambda item: item[1])
+    )
+    best = stats.best_distance(game_states.SEED)
+    if best is not None:
+        lines.append(f"  current seed ({game_states.SEED}): {best}")
+    return "\n".join(lines)
+
+
+def describe_areas(stats: run_analytics.RunStats) -> str:
+    return "\n".join(["areas:"] + [
+        f"  {utility.from_camel(name)}: {frequency:.1%}" for name, frequency in stats.area_frequencies().items()
+    ])
+
+
+def enter():
+    stats = run_analytics.get_stats()
+    BUTTONS.clear()
+    BUTTONS.add_button(game_structures.Button.make_text_button(
+        describe(stats), 50, (20, 20), None, background_color=(0, 0, 0), outline_color=(255, 255, 255),
+        x_align=0, y_align=0
+    ))
+    BUTTONS.add_button(game_structures.Button.make_text_button(
+        describe_areas(stats), 50, (game_states.WIDTH // 2, 20), None, background_color=(0, 0, 0),
+        outline_color=(255, 255, 255), x_align=0, y_align=0
+    ))
+    BUTTONS.add_button(game_structures.Button.make_text_button(
+        "Back", 75, (game_states.WIDTH, 0), main_screen.main_screen_place.start, background_color=(0, 0, 0),
+        outline_color=(255, 255, 255), x_align=1, y_align=0
+    ))
+    game_structures.BUTTONS.add_button(BUTTONS)
+
+
+def end():
+    game_structures.BUTTONS.remove(BUTTONS)
+
+
+screen = game_structures.Place(
+    tick=utility.passing,
+    enter=enter,
+    end=end,
+    static=True
+)
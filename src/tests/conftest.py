@@ -0,0 +1,62 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+sets up the game without a window, the way main.py does for headless mode, so
+tests can import any module.  Run from src: python -m pytest tests
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+# the same import order as main.py, which the modules' circular imports rely on
+from data import game_states
+from general_use import game_structures
+from run_game import gameboard
+
+game_structures.SCREEN = pygame.display.set_mode((1000, 700))
+game_states.WIDTH, game_states.HEIGHT = game_structures.SCREEN.get_size()
+game_structures.determine_screen()
+game_states.CAMERA_THRESHOLDS = (min(400, round(game_states.HEIGHT // 5)), min(400, round(game_states.HEIGHT // 5)))
+pygame.init()
+game_structures.init()
+
+
+@pytest.fixture
+def clean_boards():
+    """
+    empties the gameboard before and after a test
+    """
+    from screens import run_start_end
+    run_start_end.clean_gameboard()
+    yield
+    run_start_end.clean_gameboard()
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    """
+    runs a test in a temporary directory, for anything that writes files
+    relative to where the game runs
+    """
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
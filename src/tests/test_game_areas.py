@@ -0,0 +1,72 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+making areas on the area generator
+"""
+import time
+
+import pytest
+
+from data import game_states
+from general_use import game_structures
+from run_game import game_areas
+
+
+def test_next_area_is_placed_from_where_the_camera_was(clean_boards, monkeypatch):
+    make_game_area = game_areas.make_game_area
+
+    def slow_make_game_area(camera_bottom):
+        time.sleep(0.05)
+        make_game_area(camera_bottom)
+
+    monkeypatch.setattr(game_areas, "make_game_area", slow_make_game_area)
+    monkeypatch.setattr(game_states, "SEED", 5)
+    monkeypatch.setattr(game_states, "LAST_AREA", 1)
+    monkeypatch.setattr(game_states, "LAST_AREA_END", 0)
+    monkeypatch.setattr(game_states, "CAMERA_BOTTOM", 0)
+    game_areas.add_game_area()
+    # the camera moving on before the generator gets to the area doesn't move it
+    game_states.CAMERA_BOTTOM = 10000
+    game_areas.wait_for_next_area()
+    assert len(game_structures.NEW_AREAS) == 1
+    assert game_structures.NEW_AREAS[0].start_coordinate == game_states.HEIGHT + 100
+
+
+def test_waiting_on_an_area_that_failed_raises(clean_boards, monkeypatch):
+    made = []
+
+    def failing_make_game_area(camera_bottom):
+        made.append(camera_bottom)
+        raise ValueError("broken area")
+
+    monkeypatch.setattr(game_areas, "make_game_area", failing_make_game_area)
+    monkeypatch.setattr(game_areas, "log_error", lambda exc: None)
+    try:
+        game_areas.add_game_area()
+        game_areas.add_game_area()
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError) as info:
+            game_areas.wait_for_next_area()
+        assert time.perf_counter() - start < 1
+        assert isinstance(info.value.__cause__, ValueError)
+        # the areas after it aren't made without it
+        game_areas.add_game_area().join()
+        assert len(made) == 1
+    finally:
+        game_areas.AREA_GENERATOR.reset()
+    game_areas.add_game_area().join()
+    assert len(made) == 2
@@ -0,0 +1,44 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+drawing the screen onto the display
+"""
+import random
+
+import pygame
+
+from general_use import game_structures
+
+
+def test_updating_part_of_the_display_matches_scaling_all_of_it():
+    assert game_structures.TRUE_HEIGHT > 0, "the screen should be scaled onto the display"
+    rand = random.Random(5)
+    for _ in range(200):
+        game_structures.SCREEN.fill(
+            (rand.randrange(256), rand.randrange(256), rand.randrange(256)),
+            (rand.randrange(game_structures.SCREEN.get_width()), rand.randrange(game_structures.SCREEN.get_height()), 7, 5)
+        )
+    dirty = pygame.Rect(301, 117, 333, 209)
+    game_structures.display_screen()
+    whole = game_structures.TRUE_SCREEN.copy()
+    game_structures.TRUE_SCREEN.fill((0, 0, 0))
+    game_structures.display_rects([dirty])
+    factor = game_structures.TRUE_HEIGHT / game_structures.SCREEN.get_height()
+    true_dirty = pygame.Rect(dirty.x * factor, dirty.y * factor, dirty.width * factor, dirty.height * factor)
+    for x in range(true_dirty.left, true_dirty.right):
+        for y in range(true_dirty.top, true_dirty.bottom):
+            assert game_structures.TRUE_SCREEN.get_at((x, y)) == whole.get_at((x, y))
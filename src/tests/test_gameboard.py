@@ -0,0 +1,118 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+the board of entities in play, sorted by y
+"""
+import random
+
+from run_game import entities, gameboard
+
+
+class Point:
+    """
+    just what the board reads from an entity
+    """
+
+    def __init__(self, y: int, radius: int = 10):
+        self.y = y
+        self.size = radius
+        self.alive = True
+        self.on_board = False
+        self.index = -1
+
+    def radius(self) -> int:
+        return self.size
+
+
+def assert_sorted(board: gameboard.EntityBoard) -> None:
+    assert board.ys == [e.y for e in board]
+    assert board.ys == sorted(board.ys)
+
+
+def test_resort_after_moves():
+    rand = random.Random(5)
+    points = [Point(rand.randrange(1000)) for _ in range(200)]
+    board = gameboard.EntityBoard(sorted(points, key=lambda p: p.y))
+    for _ in range(50):
+        for p in rand.sample(points, rand.randrange(1, 20)):
+            p.y += rand.randrange(-300, 300)
+        board.resort()
+        assert_sorted(board)
+        assert sorted(map(id, board)) == sorted(map(id, points))
+
+
+def test_resort_keeps_the_order_of_entities_that_did_not_move():
+    points = [Point(y) for y in range(0, 100, 10)]
+    board = gameboard.EntityBoard(points)
+    points[2].y = 75
+    board.resort()
+    assert_sorted(board)
+    assert [p for p in board if p is not points[2]] == points[:2] + points[3:]
+
+
+def test_ranges_are_strict():
+    points = [Point(y) for y in (0, 10, 10, 20, 30)]
+    board = gameboard.EntityBoard(points)
+    assert list(board.in_range(0, 30)) == points[1:4]
+    assert list(board.in_range(10, 20)) == []
+    assert board.range_indices(-5, 100) == (0, 5)
+
+
+def test_ranges_find_entities_that_moved_since_the_last_sort():
+    points = [Point(y) for y in (0, 10, 20, 30, 500)]
+    board = gameboard.EntityBoard(points)
+    points[0].y = 15  # a dash's worth
+    points[3].y = 40
+    points[4].y = 25  # much further than a tick's movement, but next to the range
+    assert list(board.in_range(5, 30)) == [points[0], points[1], points[2], points[4]]
+    board.resort()
+    assert list(board.in_range(5, 30)) == [points[1], points[0], points[2], points[4]]
+
+
+def test_reach_counts_where_entities_are_now(monkeypatch):
+    dasher = Point(0, radius=10)
+    target = Point(100, radius=10)
+    board = gameboard.EntityBoard([dasher, target])
+    monkeypatch.setattr(gameboard, "ENTITY_BOARD", board)
+    assert list(entities.Entity.all_within(dasher, 50)) == []
+    dasher.y = 45  # after the sort, but before collisions are checked
+    assert list(entities.Entity.all_within(dasher, 50)) == [target]
+    target.y = 200
+    assert list(entities.Entity.all_within(dasher, 50)) == []
+
+
+def test_radii_follow_the_board():
+    points = [Point(y, radius) for y, radius in ((0, 5), (10, 50), (20, 5))]
+    board = gameboard.EntityBoard(points)
+    assert board.biggest_radius() == 50
+    assert all(p.on_board for p in points)
+    points[1].alive = False
+    assert board.discard_dead() == [points[1]]
+    assert not points[1].on_board
+    assert board.biggest_radius() == 5
+    board.append(Point(30, 20))
+    assert board.biggest_radius() == 20
+    points[0].size = 70
+    board.radius_changed(5, 70)
+    assert board.biggest_radius() == 70
+    assert dict(board.radii) == {5: 1, 20: 1, 70: 1}
+    del board[0]
+    assert dict(board.radii) == {5: 1, 20: 1}
+    assert board.biggest_radius() == 20
+    board.clear()
+    assert board.biggest_radius() == 0
+    assert not board.radii
@@ -0,0 +1,105 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+pooled particles, and the registry of their kinds
+"""
+import pygame
+
+from run_game import entities, particles
+
+
+def make_kind(frames: int, size: int = 10) -> particles.ParticleKind:
+    return particles.ParticleKind([pygame.Surface((size + i, size)) for i in range(frames)], tick_rate=2)
+
+
+def test_registry_grows_past_its_room(clean_boards):
+    kinds = [make_kind(1 + i % 5, size=4 + i) for i in range(100)]
+    indices = [particles.register(kind) for kind in kinds]
+    assert indices == list(range(100))
+    assert particles.register(kinds[7]) == 7
+    assert len(particles.FRAME_OFFSETS) >= 100
+    frame = 0
+    for i, kind in enumerate(kinds):
+        assert particles.FRAME_OFFSETS[i] == frame
+        assert particles.FRAME_LOOPS[i] == 2 * len(kind.frames)
+        assert particles.RADII[i] == kind.radius
+        for img in kind.frames:
+            assert particles.FRAMES[frame] is img
+            assert particles.HALF_WIDTHS[frame] == img.get_width() // 2
+            frame += 1
+
+
+def test_clearing_kinds_keeps_the_room(clean_boards):
+    for i in range(40):
+        particles.register(make_kind(2))
+    room = len(particles.RADII)
+    particles.clear_kinds()
+    kind = make_kind(1)
+    assert particles.register(kind) == 0
+    assert len(particles.RADII) == room
+
+
+def positions(pool: particles.ParticlePool) -> list[tuple[float, float]]:
+    return sorted(zip(pool.x[:pool.count].tolist(), pool.y[:pool.count].tolist()))
+
+
+def test_particles_move_and_run_out(clean_boards):
+    pool = particles.ParticlePool(capacity=2)
+    kind = make_kind(2)
+    for i in range(5):
+        pool.add(entities.Particle(kind, lifespan=i + 1, pos=(i, 0), momentum=(1, 2)))
+    assert len(pool) == 5
+    pool.tick()
+    assert positions(pool) == [(i + 1, 2) for i in range(1, 5)]
+    pool.tick()
+    pool.tick()
+    assert positions(pool) == [(i + 3, 6) for i in range(3, 5)]
+    assert pool.frame[:pool.count].tolist() == [3, 3]
+    pool.tick()
+    assert pool.frame[:pool.count].tolist() == [0]  # two frames of two ticks each loop back around
+
+
+def test_handles_follow_particles_as_they_move_in_the_arrays(clean_boards):
+    pool = particles.ParticlePool(capacity=4)
+    kind = make_kind(1)
+    handles = [pool.add(entities.Particle(kind, lifespan=10 if i % 2 else 1, pos=(i, 0))) for i in range(8)]
+    pool.tick()  # the even ones run out, and the odd ones are packed down
+    assert [handle in pool for handle in handles] == [i % 2 == 1 for i in range(8)]
+    assert pool.remove(handles[3])
+    assert handles[3] not in pool
+    assert positions(pool) == [(i, 0) for i in (1, 5, 7)]
+    assert pool.remove(handles[7])
+    assert positions(pool) == [(i, 0) for i in (1, 5)]
+    for handle in (handles[1], handles[5]):
+        slot, _ = handle
+        assert pool.x[pool.indices[slot]] in (1, 5)
+        assert pool.slot[pool.indices[slot]] == slot
+
+
+def test_stale_handles_do_not_reach_a_reused_slot(clean_boards):
+    pool = particles.ParticlePool(capacity=1)
+    kind = make_kind(1)
+    old = pool.add(entities.Particle(kind, lifespan=5, pos=(1, 0)))
+    assert pool.remove(old)
+    new = pool.add(entities.Particle(kind, lifespan=5, pos=(2, 0)))
+    assert new[0] == old[0]
+    assert old not in pool
+    assert not pool.remove(old)
+    assert positions(pool) == [(2, 0)]
+    pool.clear()
+    assert new not in pool
+    assert len(pool) == 0
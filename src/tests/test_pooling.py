@@ -0,0 +1,95 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+entity pools, and that reusing entities doesn't fool hit caches
+"""
+from data import images
+from run_game import entities, gameboard
+
+
+def take_off_board(entity: entities.Entity) -> None:
+    """
+    puts an entity on the boards, kills it, and runs the filter and sweep a tick
+    does
+    """
+    gameboard.ENTITY_BOARD.append(entity)
+    gameboard.DRAW_ENTITY_BOARD.append(entity)
+    entity.alive = False
+    gameboard.filter_entities(gameboard.ENTITY_BOARD)
+    gameboard.sweep_draw_board()
+
+
+def make_arrow() -> entities.Projectile:
+    return entities.Projectile(images.ARROW.outlined_img, 0, (0, 500), speed=5)
+
+
+def test_dead_arrow_is_not_reused_for_a_new_arrow(clean_boards):
+    # a swing keeps what it has hit for the whole swing
+    swing_hit = [make_arrow()]
+    take_off_board(swing_hit[0])
+    new_arrow = make_arrow()
+    assert new_arrow is not swing_hit[0]
+    assert new_arrow not in swing_hit
+
+
+def test_lazer_is_reused_and_reset(clean_boards):
+    lazer = entities.Lazer(500, 10, 20, 0)
+    ends = list(lazer.ends)
+    lazer.start_firing()
+    lazer.cooldown = 15
+    take_off_board(lazer)
+    for end in ends:
+        gameboard.ENTITY_BOARD.append(end)
+        gameboard.DRAW_ENTITY_BOARD.append(end)
+    gameboard.filter_entities(gameboard.ENTITY_BOARD)
+    gameboard.sweep_draw_board()
+
+    reused = entities.Lazer(700, 30, 40, 1)
+    assert reused is lazer
+    assert reused.alive and not reused.firing
+    assert reused.cooldown == 0 and reused.charge_time == 30
+    assert reused.y == 700
+    assert not reused.discarded and not reused.on_board
+    assert all(end.alive and end.parent is reused and end.y == 700 for end in reused.ends)
+
+
+def test_rotating_lazers_are_not_pooled(clean_boards):
+    lazer = entities.RotatingLazer(0, 100, 3, (0, 500), 10, 20, 0)
+    take_off_board(lazer)
+    assert entities.RotatingLazer(0, 100, 3, (0, 500), 10, 20, 0) is not lazer
+
+
+def test_pools_are_emptied_between_runs(clean_boards):
+    lazer = entities.Lazer(500, 10, 20, 0)
+    take_off_board(lazer)
+    entities.Pooled.clear_pools()
+    assert entities.Lazer(500, 10, 20, 0) is not lazer
+
+
+def test_making_an_entity_while_another_thread_empties_its_pool(clean_boards, monkeypatch):
+    class EmptiedPool(list):
+        """
+        a pool that had an entity when checked, but another thread took it
+        before it could be popped
+        """
+
+        def __bool__(self):
+            return True
+
+    monkeypatch.setitem(entities.Pooled._Pooled__pools, entities.Lazer, EmptiedPool())
+    assert isinstance(entities.Lazer(500, 10, 20, 0), entities.Lazer)
@@ -0,0 +1,136 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+recording run input and playing it back
+"""
+import os
+
+import pygame
+import pytest
+
+from run_game import ingame, replay
+
+
+def key(name: str) -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=getattr(ingame.Inputs, name), mod=0, unicode="", scancode=0)
+
+
+def click(button: int) -> pygame.event.Event:
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(0, 0))
+
+
+class Pressed:
+    """
+    held keys, the way pygame.key.get_pressed gives them
+    """
+
+    def __init__(self, names: set[str]):
+        self.keys = {getattr(ingame.Inputs, name) for name in names}
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.keys
+
+
+def record(ticks: list[tuple[set[str], list[pygame.event.Event]]], monkeypatch) -> str:
+    """
+    records ticks of held inputs and events, and saves them
+    :return: the path to the replay
+    """
+    monkeypatch.setattr(ingame, "paused", False)
+    recorder = replay.Recorder(5)
+    for held, events in ticks:
+        recorder.tick(Pressed(held))
+        for event in events:
+            recorder.event(event)
+    return recorder.save()
+
+
+def play(path: str) -> list[tuple[set[int], list[tuple[int, int]]]]:
+    """
+    plays a replay back
+    :return: the held keys and posted events of each tick
+    """
+    playing = replay.Replay(path)
+    pygame.event.clear()
+    ticks = []
+    while True:
+        playing.tick()
+        if playing.finished:
+            return ticks
+        ticks.append((
+            set(playing.held_keys),
+            [(e.type, e.key if e.type == pygame.KEYDOWN else e.button) for e in pygame.event.get()]
+        ))
+
+
+@pytest.mark.parametrize("num", [0, 1, 0x7F, 0x80, 300, 0x3FFF, 0x4000, 2 ** 35 + 17])
+def test_varints_round_trip(num):
+    data = bytearray(b"x")
+    replay.write_varint(data, num)
+    data += b"y"
+    assert len(data) == 2 + max(1, (num.bit_length() + 6) // 7)
+    assert replay.read_varint(bytes(data), 1) == (num, len(data) - 1)
+
+
+def test_identical_ticks_are_stored_once(in_tmp, monkeypatch):
+    path = record(
+        [({"up_input"}, [])] * 1000 + [(set(), [])] * 3 + [({"down_input", "prefer_pickup"}, [])] * 200,
+        monkeypatch
+    )
+    seed, dimensions, data = replay.read_header(path)
+    assert seed == 5
+    # held inputs, no events and a two byte tick count, then two with one byte counts
+    assert len(data) == (1 + 1 + 2) + (1 + 1 + 1) + (1 + 1 + 2)
+    up, down, pickup = ingame.Inputs.up_input, ingame.Inputs.down_input, ingame.Inputs.prefer_pickup
+    assert play(path) == [({up}, [])] * 1000 + [(set(), [])] * 3 + [({down, pickup}, [])] * 200
+
+
+def test_other_files_and_versions_are_refused(in_tmp):
+    (in_tmp / "not.dtlr").write_bytes(b"PNG" + bytes(20))
+    (in_tmp / "old.dtlr").write_bytes(replay.REPLAY_MAGIC + bytes([1]) + bytes(12))
+    with pytest.raises(ValueError, match="not a replay"):
+        replay.read_header(str(in_tmp / "not.dtlr"))
+    with pytest.raises(ValueError, match="version 1"):
+        replay.read_header(str(in_tmp / "old.dtlr"))
+
+
+def test_events_play_back_in_order(in_tmp, monkeypatch):
+    path = record([
+        ({"up_input"}, []),
+        ({"up_input"}, [click(3), key("dash"), click(1), click(3)]),
+        ({"up_input"}, []),
+        ({"up_input"}, [key("next_text"), key("next_text")]),
+    ], monkeypatch)
+    up = {ingame.Inputs.up_input}
+    assert play(path) == [
+        (up, []),
+        (up, [(pygame.MOUSEBUTTONDOWN, 3), (pygame.KEYDOWN, ingame.Inputs.dash), (pygame.MOUSEBUTTONDOWN, 1), (pygame.MOUSEBUTTONDOWN, 3)]),
+        (up, []),
+        (up, [(pygame.KEYDOWN, ingame.Inputs.next_text), (pygame.KEYDOWN, ingame.Inputs.next_text)]),
+    ]
+
+
+def test_only_the_newest_replays_are_kept(in_tmp, monkeypatch):
+    monkeypatch.setattr(replay, "REPLAY_LIMIT", 2)
+    (in_tmp / "replays").mkdir()
+    for name in ("200101-000000-1.dtlr", "200101-000001-2.dtlr", "notes.txt"):
+        (in_tmp / "replays" / name).write_bytes(b"")
+    path = record([(set(), [])], monkeypatch)
+    assert replay.saved_replays() == [os.path.join(replay.REPLAY_FOLDER, "200101-000001-2.dtlr"), path]
+    replay.clear()
+    assert replay.saved_replays() == []
+    assert (in_tmp / "replays" / "notes.txt").exists()
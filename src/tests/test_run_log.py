@@ -0,0 +1,166 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+the run log and its index
+"""
+import json
+import os
+
+import pytest
+
+from general_use import run_log, utility
+
+
+def write_old_log(path, runs: list[dict]) -> None:
+    with open(path, "w") as old_file:
+        for run in runs:
+            old_file.write(f"{run!r}\n")
+
+
+def runs(n: int, start: int = 0) -> list[dict]:
+    return [{"reason": "die", "furthest": i} for i in range(start, start + n)]
+
+
+def test_runs_are_read_by_number(in_tmp):
+    log = run_log.RunLog()
+    log.extend(runs(5))
+    log.append({"reason": "win", "furthest": 5})
+    assert len(log) == 6
+    assert log[2]["furthest"] == 2
+    assert log[-1]["reason"] == "win"
+    assert [run["furthest"] for run in log.iter_from(4)] == [4, 5]
+    assert [run["furthest"] for run in reversed(log)] == [5, 4, 3, 2, 1, 0]
+    with pytest.raises(IndexError):
+        log[6]
+    log.clear()
+    assert len(log) == 0
+    assert list(log) == []
+
+
+def test_check_indexes_an_unindexed_tail(in_tmp):
+    log = run_log.RunLog()
+    log.extend(runs(3))
+    # the game closed after writing runs, before indexing them
+    with open(run_log.LOG_PATH, "ab") as log_file:
+        for run in runs(2, start=3):
+            log_file.write(json.dumps(run).encode() + b"\n")
+    assert len(log) == 3
+    log.check()
+    assert len(log) == 5
+    assert [log[i]["furthest"] for i in range(5)] == list(range(5))
+
+
+def test_check_reindexes_when_the_index_is_ahead_of_the_log(in_tmp):
+    log = run_log.RunLog()
+    log.extend(runs(4))
+    # the log was replaced with a shorter one, but the index wasn't
+    with open(run_log.LOG_PATH, "wb") as log_file:
+        for run in runs(2, start=10):
+            log_file.write(json.dumps(run).encode() + b"\n")
+    log.check()
+    assert len(log) == 2
+    assert [log[i]["furthest"] for i in range(2)] == [10, 11]
+
+
+def test_check_cuts_off_a_half_written_run(in_tmp):
+    log = run_log.RunLog()
+    log.extend(runs(2))
+    with open(run_log.LOG_PATH, "ab") as log_file:
+        log_file.write(b'{"reason": "di')
+    for indexed in (False, True):
+        if indexed:  # the index got ahead of the write, as an older check would leave it
+            with open(run_log.INDEX_PATH, "ab") as index_file:
+                index_file.write(os.path.getsize(run_log.LOG_PATH).to_bytes(run_log.OFFSET_SIZE, "little"))
+            with open(run_log.LOG_PATH, "ab") as log_file:
+                log_file.write(b'{"reason": "di')
+        log.check()
+        assert len(log) == 2
+    log.append({"reason": "win", "furthest": 2})
+    assert [run["furthest"] for run in log] == [0, 1, 2]
+    assert log[2]["reason"] == "win"
+
+
+def test_runs_that_cannot_be_read_are_skipped_and_logged(in_tmp, monkeypatch):
+    errors = []
+    monkeypatch.setattr(utility, "log_error", errors.append)
+    log = run_log.RunLog()
+    log.extend(runs(2))
+    with open(run_log.LOG_PATH, "ab") as log_file:
+        log_file.write(b"not a run\n")
+    log.check()
+    log.extend(runs(2, start=2))
+    assert len(log) == 5
+    assert [run["furthest"] for run in log] == [0, 1, 2, 3]
+    assert [run["furthest"] for run in log.iter_from(1)] == [1, 2, 3]
+    assert [run["furthest"] for run in reversed(log)] == [3, 2, 1, 0]
+    assert len(errors) == 2
+
+
+def test_check_makes_an_empty_log(in_tmp):
+    log = run_log.RunLog()
+    log.check()
+    assert len(log) == 0
+    assert sorted(os.listdir(in_tmp)) == ["run_log.idx", "run_log.jsonl"]
+
+
+def test_migration_moves_old_runs_once(in_tmp):
+    log = run_log.RunLog()
+    log.check()
+    log.append({"reason": "die", "furthest": 0})
+    with open(run_log.OLD_LOG_PATH, "w") as old_file:
+        old_file.write("{'reason': 'win', 'furthest': 1}\n\nnot a run\n{'reason': 'quit', 'furthest': 2}\n")
+    assert log.migrate() == 2
+    assert log.migrate() == 0
+    assert [run["furthest"] for run in log] == [0, 1, 2]
+    assert not os.path.exists(run_log.OLD_LOG_PATH)
+
+
+def test_interrupted_migration_is_redone_without_duplicates(in_tmp, monkeypatch):
+    log = run_log.RunLog()
+    log.append({"reason": "die", "furthest": 1})
+    write_old_log(run_log.OLD_LOG_PATH, [{"reason": "win", "furthest": 2}, {"reason": "quit", "furthest": 3}])
+    replace = os.replace
+
+    def crash_before_renaming(src, dst):
+        if dst.endswith(".migrated"):
+            raise KeyboardInterrupt
+        replace(src, dst)
+
+    monkeypatch.setattr(run_log.os, "replace", crash_before_renaming)
+    with pytest.raises(KeyboardInterrupt):
+        log.migrate()
+    assert len(log) == 3
+    monkeypatch.setattr(run_log.os, "replace", replace)
+
+    assert log.migrate() == 2
+    assert [run["furthest"] for run in log] == [1, 2, 3]
+    assert [log[i]["furthest"] for i in range(len(log))] == [1, 2, 3]
+    assert log.migrate() == 0
+    assert sorted(os.listdir(in_tmp)) == ["run_log.idx", "run_log.jsonl", "run_log.txt.migrated"]
+
+
+def test_migration_finished_before_its_marker_was_removed(in_tmp, monkeypatch):
+    log = run_log.RunLog()
+    write_old_log(run_log.OLD_LOG_PATH, [{"reason": "win", "furthest": 2}])
+    remove = os.remove
+    monkeypatch.setattr(run_log.os, "remove", lambda path: None)
+    log.migrate()
+    monkeypatch.setattr(run_log.os, "remove", remove)
+    assert os.path.exists(run_log.OLD_LOG_PATH + ".migrating")
+    assert log.migrate() == 0
+    assert [run["furthest"] for run in log] == [2]
+    assert not os.path.exists(run_log.OLD_LOG_PATH + ".migrating")
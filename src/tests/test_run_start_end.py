@@ -0,0 +1,64 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+logging runs at their end
+"""
+import datetime
+import os
+
+from data import game_states
+from general_use import run_analytics, run_log, utility
+from screens import run_start_end
+
+
+def test_no_log_when_runs_are_not_logged(in_tmp, clean_boards, monkeypatch):
+    monkeypatch.setattr(run_start_end, "LOG_RUNS", False)
+    monkeypatch.setattr(game_states, "RUN_START", datetime.datetime.now())
+    run_start_end.log_run(run_start_end.RunEndReasons.close)
+    assert os.listdir(in_tmp) == []
+
+
+def test_ending_a_run_leaves_catching_up_to_the_stats_screen(in_tmp, clean_boards, monkeypatch):
+    monkeypatch.setattr(game_states, "RUN_START", datetime.datetime.now())
+    monkeypatch.setattr(run_analytics, "__stats", None)
+    run_log.RunLog().extend([{"reason": "quit"}] * 3)
+    iter_from = run_log.RunLog.iter_from
+
+    def read_runs(self, i):
+        raise AssertionError(f"read old runs from {i}")
+    monkeypatch.setattr(run_log.RunLog, "iter_from", read_runs)
+    run_start_end.log_run(run_start_end.RunEndReasons.close)
+    monkeypatch.setattr(run_log.RunLog, "iter_from", iter_from)
+    assert run_analytics.get_stats().runs == 4
+    run_start_end.log_run(run_start_end.RunEndReasons.close)
+    assert run_analytics.get_stats().runs == 5
+    assert run_analytics.load().runs == 5
+
+
+def test_a_run_that_cannot_be_read_does_not_stop_runs_being_logged(in_tmp, clean_boards, monkeypatch):
+    monkeypatch.setattr(game_states, "RUN_START", datetime.datetime.now())
+    monkeypatch.setattr(run_analytics, "__stats", None)
+    monkeypatch.setattr(utility, "log_error", lambda exc: None)
+    log = run_log.RunLog()
+    log.extend([{"reason": "quit"}])
+    with open(run_log.LOG_PATH, "ab") as log_file:
+        log_file.write(b"not a run\n")
+    log.check()
+    assert run_analytics.get_stats().runs == 2
+    run_start_end.log_run(run_start_end.RunEndReasons.close)
+    assert run_analytics.get_stats().runs == 3
+    assert len(run_log.RunLog()) == 3
@@ -0,0 +1,33 @@
+"""
+A 1.5d hack-and-slash game.
+Copyright (C) 2023  Lyx Huston
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or any
+later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+the main loop's tick
+"""
+from general_use import utility
+
+
+def test_low_fps_debug_without_a_frame_target():
+    # headless mode runs uncapped, and admin mode turns on the low fps debug
+    utility.set_game_tick(utility.passing)
+    utility.set_fps(None)
+    utility.set_debug_low_fps(True)
+    try:
+        for _ in range(3):
+            utility.tick()
+    finally:
+        utility.set_debug_low_fps(False)